@@ -2,6 +2,30 @@
 
 from app.setup_imports import *
 from flask_app.app.sql_models import SARSATAlert, WeatherData, SessionLocal
+from functools import lru_cache
+from sqlalchemy.exc import IntegrityError
+
+# Optional C ISO-8601 parser; pandas handles everything it rejects
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+    HAS_CISO8601 = True
+except Exception:
+    HAS_CISO8601 = False
+
+@lru_cache(maxsize=1024)
+def _parse_detect_time_str(text):
+    """Parse one detect_time string (memoized: repeated alerts reuse the Timestamp)."""
+    if HAS_CISO8601:
+        try:
+            return pd.Timestamp(_parse_iso_datetime(text))
+        except ValueError:
+            pass  # not ISO-8601 (e.g. MM/DD/YYYY HH:MM): fall through to pandas
+    return pd.to_datetime(text, errors='coerce')
+
+def _parse_detect_time(value):
+    if isinstance(value, str):
+        return _parse_detect_time_str(value.strip())
+    return pd.to_datetime(value, errors='coerce')
 
 def save_alert_to_db(df):
     """
@@ -12,7 +36,7 @@ def save_alert_to_db(df):
         alert = SARSATAlert(
             beacon_id=df.iloc[0]["beacon_id"],
             site_id=df.iloc[0].get("site_id"),
-            detect_time=pd.to_datetime(df.iloc[0]["detect_time"], errors='coerce'),
+            detect_time=_parse_detect_time(df.iloc[0]["detect_time"]),
             latitude_a=df.iloc[0].get("latitude_a"),
             longitude_a=df.iloc[0].get("longitude_a"),
             latitude_b=df.iloc[0].get("latitude_b"),
@@ -39,35 +63,43 @@ def save_alert_to_db(df):
     finally:
         session.close()
 
+# WeatherData columns copied straight from the weather frame (row.get -> None when absent)
+_WEATHER_FIELDS = (
+    "temperature", "dewpoint", "humidity", "pressure", "visibility", "wind_speed", "wind_gust",
+    "wind_direction", "wave_height", "wave_period", "sea_state", "water_temperature",
+    "current_speed", "current_direction",
+)
+
 def save_weather_to_db(alert_id, weather_df, position):
     """
     Saves fetched weather data for a specific alert ID and position (A/B) to PostgreSQL.
     """
     session = SessionLocal()
     try:
-        for _, row in weather_df.iterrows():
-            weather = WeatherData(
-                alert_id=alert_id,
-                station_id=row["station_id"],
-                temperature=row.get("temperature"),
-                dewpoint=row.get("dewpoint"),
-                humidity=row.get("humidity"),
-                pressure=row.get("pressure"),
-                visibility=row.get("visibility"),
-                wind_speed=row.get("wind_speed"),
-                wind_gust=row.get("wind_gust"),
-                wind_direction=row.get("wind_direction"),
-                wave_height=row.get("wave_height"),
-                wave_period=row.get("wave_period"),
-                sea_state=row.get("sea_state"),
-                water_temperature=row.get("water_temperature"),
-                current_speed=row.get("current_speed"),
-                current_direction=row.get("current_direction"),
-                observation_time=pd.to_datetime(row.get("observation_time"), errors='coerce'),
-                position_label=position  # New field (ensure schema supports this)
-            )
-            session.add(weather)
-        session.commit()
+        rows = [
+            {
+                "alert_id": alert_id,
+                "station_id": row["station_id"],
+                **{field: row.get(field) for field in _WEATHER_FIELDS},
+                "observation_time": pd.to_datetime(row.get("observation_time"), errors='coerce'),
+                "position_label": position,  # New field (ensure schema supports this)
+            }
+            for row in weather_df.to_dict("records")
+        ]
+        # One executemany INSERT + one commit instead of an ORM add per observation
+        try:
+            session.bulk_insert_mappings(WeatherData, rows)
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            logging.warning(f"âš ï¸ Bulk weather insert rejected; retrying row by row for alert ID: {alert_id}")
+            for r in rows:
+                try:
+                    session.add(WeatherData(**r))
+                    session.commit()
+                except IntegrityError as e:
+                    session.rollback()
+                    logging.error(f"âŒ Skipped weather row for station {r['station_id']}: {e}")
         logging.info(f"âœ… Weather data saved for alert ID: {alert_id}, Position: {position}")
     except Exception as e:
         session.rollback()
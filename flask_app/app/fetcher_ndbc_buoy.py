@@ -2,7 +2,7 @@
 
 from app.setup_imports import *
 from flask_app.app.utils import log_error_and_continue, get_current_utc_timestamp
-from flask_app.app.utils_geo import haversine_nm
+from flask_app.app.utils_geo import haversine_nm_vec
 from flask_app.app.utils_weather import calculate_timelate
 
 METADATA_PATH = os.path.join(
@@ -11,10 +11,19 @@ METADATA_PATH = os.path.join(
     'ndbc_station_metadata_full.csv'
 )
 
+# Parsed metadata CSV, reused until the file's mtime changes: (mtime, DataFrame)
+_METADATA_CACHE = (None, None)
+
 def load_buoy_metadata():
+    global _METADATA_CACHE
     try:
+        mtime = os.stat(METADATA_PATH).st_mtime
+        if _METADATA_CACHE[0] == mtime:
+            return _METADATA_CACHE[1].copy()  # callers add columns (distance_nm)
         logging.info(f"{get_current_utc_timestamp()} ðŸ“„ Loading buoy metadata from: {METADATA_PATH}")
-        return pd.read_csv(METADATA_PATH)
+        metadata_df = pd.read_csv(METADATA_PATH)
+        _METADATA_CACHE = (mtime, metadata_df)
+        return metadata_df.copy()
     except Exception as e:
         log_error_and_continue(f"{get_current_utc_timestamp()} âŒ Failed to load buoy metadata: {e}")
         return pd.DataFrame()
@@ -26,11 +35,16 @@ def fetch_ndbc_buoy_data(lat, lon, position_label):
             logging.error(f"{get_current_utc_timestamp()} âš ï¸ No buoy metadata available â€” returning empty DataFrame.")
             return pd.DataFrame()
 
-        metadata_df['distance_nm'] = metadata_df.apply(
-            lambda row: haversine_nm(lat, lon, row['latitude'], row['longitude']),
-            axis=1
+        metadata_df['distance_nm'] = haversine_nm_vec(
+            lat, lon, metadata_df['latitude'].to_numpy(), metadata_df['longitude'].to_numpy()
         )
-        nearby_buoys = metadata_df.nsmallest(10, 'distance_nm').copy()
+        # Top-10 by partial selection (O(N)), then order just those; NaN distances sort last and are dropped
+        d = metadata_df['distance_nm'].to_numpy()
+        k = min(10, len(d))
+        idx = np.argpartition(d, k - 1)[:k] if k < len(d) else np.arange(len(d))
+        idx = idx[np.argsort(d[idx], kind='stable')]
+        idx = idx[~np.isnan(d[idx])]
+        nearby_buoys = metadata_df.iloc[idx].copy()
 
         if nearby_buoys.empty:
             logging.warning(f"{get_current_utc_timestamp()} âš ï¸ No nearby buoys found â€” returning empty DataFrame.")
@@ -121,6 +121,20 @@ FIELD_CONFIG: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Coordinate patterns compiled once at import (the pre-scan runs the pair validator on every message line)
+_DEC_MIN_LAT_RE = re.compile(r"^(?P<deg>\d{1,2})\s+(?P<min>[0-5]?\d(?:\.\d+)?)\s*[NS]$")
+_DEC_MIN_LON_RE = re.compile(r"^(?P<deg>\d{1,3})\s+(?P<min>[0-5]?\d(?:\.\d+)?)\s*[EW]$")
+_MINUTES_ONLY_RE = re.compile(r"^(?P<min>[0-5]?\d(?:\.\d+)?)\s*[NSEW]$")
+_DMS_TOKEN_RE = re.compile(r"^(?P<deg>\d{1,3})[°\s]+(?P<min>\d{1,2}(?:\.\d+)?)[\'\s]*(?P<sec>\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]$")
+_DD_TOKEN_RE = re.compile(r"^(?P<dd>[+-]?\d{1,3}\.\d+)[NSEW]$")
+_PAIR_DEC_MIN_RE = re.compile(r"(?P<lat>\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS])\s+(?P<lon>\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW])|(?P<lon2>\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW])\s+(?P<lat2>\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS])")
+_MINUTES_FRAGMENT_RE = re.compile(r"^[0-5]?\d(?:\.\d+)?[NSEW]$")
+_DM_LAT_RE = re.compile(r"\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS]")
+_DM_LON_RE = re.compile(r"\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW]")
+_PAIR_TOKEN_RE = re.compile(r"\d{1,3}[°\s]+\d{1,2}(?:\.\d+)?[\'\s]*(?:\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]|[+-]?\d{1,3}\.\d+[NSEW]")
+_PAIR_DMS_RE = re.compile(r"^\d{1,3}[°\s]+\d{1,2}(?:\.\d+)?[\'\s]*(?:\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]$")
+_PAIR_DD_RE = re.compile(r"^[+-]?\d{1,3}\.\d+[NSEW]$")
+
 def validate_and_extract(field_name: str, raw_text: str, config: dict, context: Optional[dict] = None) -> dict:
     """
     Generic field extraction and validation pipeline.
@@ -398,13 +412,8 @@ def validate_and_extract_coordinate_token(field_name: str, raw_text: str, config
     std = clean_and_standardize_coordinate(text)
     checks_passed, checks_failed, notes = [], [], []
 
-    # Decimal-minutes regex (robust, preserves leading zeros)
-    dec_min_lat = r"^(?P<deg>\d{1,2})\s+(?P<min>[0-5]?\d(?:\.\d+)?)\s*[NS]$"
-    dec_min_lon = r"^(?P<deg>\d{1,3})\s+(?P<min>[0-5]?\d(?:\.\d+)?)\s*[EW]$"
-    minutes_only = r"^(?P<min>[0-5]?\d(?:\.\d+)?)\s*[NSEW]$"
-
-    # Reject minutes-only fragments
-    if re.match(minutes_only, std):
+    # Reject minutes-only fragments (decimal-minutes patterns preserve leading zeros)
+    if _MINUTES_ONLY_RE.match(std):
         notes.append("Rejected: minutes-only fragment (no degree component)")
         return {
             "value": None,
@@ -423,9 +432,9 @@ def validate_and_extract_coordinate_token(field_name: str, raw_text: str, config
     parse_ok = False
     m = None
     if field_name == "latitude":
-        m = re.match(dec_min_lat, std)
+        m = _DEC_MIN_LAT_RE.match(std)
     elif field_name == "longitude":
-        m = re.match(dec_min_lon, std)
+        m = _DEC_MIN_LON_RE.match(std)
     if m:
         structure_ok = True
         deg = m.group("deg")
@@ -446,9 +455,7 @@ def validate_and_extract_coordinate_token(field_name: str, raw_text: str, config
     else:
         # Try DMS or DD fallback
         # DMS: 37°45.600'N or 075°30.200'W
-        dms_pat = r"^(?P<deg>\d{1,3})[°\s]+(?P<min>\d{1,2}(?:\.\d+)?)[\'\s]*(?P<sec>\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]$"
-        dd_pat = r"^(?P<dd>[+-]?\d{1,3}\.\d+)[NSEW]$"
-        m = re.match(dms_pat, std)
+        m = _DMS_TOKEN_RE.match(std)
         if m:
             structure_ok = True
             deg = m.group("deg")
@@ -469,7 +476,7 @@ def validate_and_extract_coordinate_token(field_name: str, raw_text: str, config
                 notes.append(f"parse_error: {e}")
             notes.append("Matched DMS format")
         else:
-            m = re.match(dd_pat, std)
+            m = _DD_TOKEN_RE.match(std)
             if m:
                 structure_ok = True
                 dd = m.group("dd")
@@ -538,8 +545,7 @@ def validate_and_extract_coordinate_pair(field_name: str, raw_text: str, config:
     start_pos = end_pos = None
 
     # Pair-first: decimal-minutes regex for lat+lon (any order, preserves leading zeros)
-    pair_dec_min = re.compile(r"(?P<lat>\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS])\s+(?P<lon>\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW])|(?P<lon2>\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW])\s+(?P<lat2>\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS])")
-    m = pair_dec_min.search(std)
+    m = _PAIR_DEC_MIN_RE.search(std)
     if m:
         # Support both lat-lon and lon-lat order
         lat_token = m.group("lat") or m.group("lat2")
@@ -548,7 +554,7 @@ def validate_and_extract_coordinate_pair(field_name: str, raw_text: str, config:
         end_pos = m.end()
         format_type = "Decimal Minutes"
         # Reject minutes-only fragments
-        if re.match(r"^[0-5]?\d(?:\.\d+)?[NSEW]$", lat_token) or re.match(r"^[0-5]?\d(?:\.\d+)?[NSEW]$", lon_token):
+        if _MINUTES_FRAGMENT_RE.match(lat_token) or _MINUTES_FRAGMENT_RE.match(lon_token):
             checks_failed.append("pair_structure"); notes.append("pair: minutes-only fragment detected")
         else:
             r_lat = validate_and_extract_coordinate_token("latitude", lat_token, config, context)
@@ -581,14 +587,12 @@ def validate_and_extract_coordinate_pair(field_name: str, raw_text: str, config:
             }
 
     # Proximity fallback: find individual DM lat & lon tokens within 120 chars
-    dm_lat_pat = r"\d{1,2}\s+[0-5]?\d(?:\.\d+)?\s*[NS]"
-    dm_lon_pat = r"\d{1,3}\s+[0-5]?\d(?:\.\d+)?\s*[EW]"
-    lat_matches = [m for m in re.finditer(dm_lat_pat, std)]
-    lon_matches = [m for m in re.finditer(dm_lon_pat, std)]
+    lat_matches = list(_DM_LAT_RE.finditer(std))
+    lon_matches = list(_DM_LON_RE.finditer(std))
     for lat_m in lat_matches:
         for lon_m in lon_matches:
             # Reject minutes-only fragments
-            if re.match(r"^[0-5]?\d(?:\.\d+)?[NSEW]$", lat_m.group(0)) or re.match(r"^[0-5]?\d(?:\.\d+)?[NSEW]$", lon_m.group(0)):
+            if _MINUTES_FRAGMENT_RE.match(lat_m.group(0)) or _MINUTES_FRAGMENT_RE.match(lon_m.group(0)):
                 continue
             # Proximity check
             if abs(lat_m.start() - lon_m.start()) <= 120:
@@ -627,18 +631,15 @@ def validate_and_extract_coordinate_pair(field_name: str, raw_text: str, config:
                 }
 
     # Fallback: try to find two tokens (DMS or DD)
-    token_pat = r"\d{1,3}[°\s]+\d{1,2}(?:\.\d+)?[\'\s]*(?:\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]|[+-]?\d{1,3}\.\d+[NSEW]"
-    tokens = re.findall(token_pat, std)
+    tokens = _PAIR_TOKEN_RE.findall(std)
     if len(tokens) >= 2:
         lat_token = next((t for t in tokens if t.strip().upper().endswith(("N","S"))), None)
         lon_token = next((t for t in tokens if t.strip().upper().endswith(("E","W"))), None)
         # Determine format type for each token
-        dms_pat = r"^\d{1,3}[°\s]+\d{1,2}(?:\.\d+)?[\'\s]*(?:\d{1,2}(?:\.\d+)?)?[\"\s]*[NSEW]$"
-        dd_pat = r"^[+-]?\d{1,3}\.\d+[NSEW]$"
-        lat_is_dms = bool(lat_token and re.match(dms_pat, lat_token))
-        lon_is_dms = bool(lon_token and re.match(dms_pat, lon_token))
-        lat_is_dd = bool(lat_token and re.match(dd_pat, lat_token))
-        lon_is_dd = bool(lon_token and re.match(dd_pat, lon_token))
+        lat_is_dms = bool(lat_token and _PAIR_DMS_RE.match(lat_token))
+        lon_is_dms = bool(lon_token and _PAIR_DMS_RE.match(lon_token))
+        lat_is_dd = bool(lat_token and _PAIR_DD_RE.match(lat_token))
+        lon_is_dd = bool(lon_token and _PAIR_DD_RE.match(lon_token))
         if lat_is_dms and lon_is_dms:
             format_type = "DMS"
         elif lat_is_dd and lon_is_dd:
@@ -3,6 +3,9 @@
 # Last Updated (UTC): 2025-09-15
 # Update Summary:
 #   - Initial implementation: builds unified GIS map input DataFrame from positions, weather, and stations.
+#   - Row loops iterate plain dicts (to_dict("records")) instead of iterrows() Series.
+#   - Popup HTML and weather display strings are built column-wise before the row loops.
+#   - layer / geom_type returned as pandas categoricals.
 # Description:
 #   - Pure transforms to produce a single DataFrame for GIS mapping, including alert positions, range rings, weather, and station layers.
 # Data Handling Notes:
@@ -13,7 +16,7 @@ import logging
 import pandas as pd
 import numpy as np
 from typing import Optional
-from app.utils_display import format_us_display, to_dual_time, derive_local_tz
+from app.utils_display import format_us_display, format_us_display_vec, to_dual_time, derive_local_tz
 
 LOG = logging.getLogger(__name__)
 
@@ -39,6 +42,25 @@ def _fmt_num(v, decimals):
 def _latlon_str(lat, lon):
     return f"Lat: {_fmt_num(lat, 5)}, Lon: {_fmt_num(lon, 5)}"
 
+# Column-wise variants of the helpers above: popup strings are assembled per layer with
+# pandas string ops, so the row loops below only pick them up.
+def _num_col(df, key):
+    if key not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype=float)
+    return pd.to_numeric(df[key], errors="coerce")
+
+def _str_col(df, key, default):
+    if key not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[key].astype(str)
+
+def _fmt_num_col(df, key, decimals):
+    num = _num_col(df, key)
+    return num.map(f"{{:.{decimals}f}}".format).where(num.notna(), "—")
+
+def _latlon_col(df):
+    return "Lat: " + _fmt_num_col(df, "lat_dd", 5) + ", Lon: " + _fmt_num_col(df, "lon_dd", 5)
+
 def build_gis_map_inputs_df(
     positions_df: pd.DataFrame,
     wx_df: Optional[pd.DataFrame] = None,
@@ -65,7 +87,7 @@ def build_gis_map_inputs_df(
     center_lat, center_lon = None, None
     site_id = None
     if positions_df is not None and not positions_df.empty:
-        for _, r in positions_df.iterrows():
+        for r in positions_df.to_dict("records"):
             if pd.notna(r.get("lat_dd")) and pd.notna(r.get("lon_dd")):
                 center_lat, center_lon = float(r["lat_dd"]), float(r["lon_dd"])
                 site_id = r.get("site_id")
@@ -85,14 +107,13 @@ def build_gis_map_inputs_df(
 
     # --- Alert positions layer ---
     if positions_df is not None and not positions_df.empty:
-        for _, r in positions_df.iterrows():
+        pos_popups = "<b>" + _str_col(positions_df, "role", "Alert") + "</b><br>" + _latlon_col(positions_df)
+        for r, popup_html in zip(positions_df.to_dict("records"), pos_popups.tolist()):
             lat = r.get("lat_dd")
             lon = r.get("lon_dd")
             label = r.get("role", "Alert")
             ts = r.get("ts_utc", None)
             ts_utc, ts_local = to_dual_time(ts, local_tz) if ts is not None else (None, None)
-            popup_fields = [f"<b>{label}</b>", _latlon_str(lat, lon)]
-            popup_html = "<br>".join(popup_fields)
             rows.append({
                 "site_id": r.get("site_id"),
                 "layer": "alert_position",
@@ -118,15 +139,16 @@ def build_gis_map_inputs_df(
 
     # --- Range rings layer (if present) ---
     if positions_df is not None and not positions_df.empty and "range_ring_meters" in positions_df.columns:
-        for _, r in positions_df.iterrows():
+        ring_num = _num_col(positions_df, "range_ring_meters")
+        ring_labels = "Range Ring " + _fmt_num_col(positions_df, "range_ring_meters", 0) + " m"
+        ring_popups = ("<b>" + ring_labels + "</b><br>" + _latlon_col(positions_df)
+                       + "<br>Radius: " + np.trunc(ring_num).map("{:.0f}".format) + " m")
+        for r, label, popup_html in zip(positions_df.to_dict("records"), ring_labels.tolist(), ring_popups.tolist()):
             ring_m = r.get("range_ring_meters")
             lat = r.get("lat_dd")
             lon = r.get("lon_dd")
             if ring_m is None or np.isnan(ring_m):
                 continue
-            label = f"Range Ring {_fmt_num(ring_m, 0)} m"
-            radius_line = f"Radius: {int(ring_m)} m" if ring_m is not None else "Radius: —"
-            popup_html = "<br>".join([f"<b>{label}</b>", _latlon_str(lat, lon), radius_line])
             rows.append({
                 "site_id": r.get("site_id"),
                 "layer": "range_ring",
@@ -152,7 +174,13 @@ def build_gis_map_inputs_df(
 
     # --- Weather layer ---
     if wx_df is not None and not wx_df.empty:
-        for _, w in wx_df.iterrows():
+        wx_displays = format_us_display_vec(_num_col(wx_df, "wave_height_m"), _num_col(wx_df, "wind_ms"),
+                                            _num_col(wx_df, "temp_C"))
+        wx_heads = "<b>Weather</b><br>" + _latlon_col(wx_df)
+        wx_tails = ("<br>Waves: " + wx_displays["wave_height_display"] + "<br>Wind: " + wx_displays["wind_display"]
+                    + "<br>Temp: " + wx_displays["temp_display"])
+        for w, disp, head, tail in zip(wx_df.to_dict("records"), wx_displays.to_dict("records"),
+                                       wx_heads.tolist(), wx_tails.tolist()):
             lat = w.get("lat_dd")
             lon = w.get("lon_dd")
             ts = w.get("obs_time", None)
@@ -160,19 +188,13 @@ def build_gis_map_inputs_df(
             wave_m = w.get("wave_height_m")
             wind_ms = w.get("wind_ms")
             temp_C = w.get("temp_C")
-            display = format_us_display(
-                wave_height_m=wave_m,
-                wind_ms=wind_ms,
-                temp_C=temp_C
-            )
-            wave_display = display.get("wave_height_display", "None")
-            wind_display = display.get("wind_display", "None")
-            temp_display = display.get("temp_display", "None")
-            popup_fields = [f"<b>Weather</b>", _latlon_str(lat, lon)]
-            if ts_utc: popup_fields.append(f"UTC: {ts_utc}")
-            if ts_local: popup_fields.append(f"Local: {ts_local}")
-            popup_fields += [f"Waves: {wave_display}", f"Wind: {wind_display}", f"Temp: {temp_display}"]
-            popup_html = "<br>".join(popup_fields)
+            wave_display = disp["wave_height_display"]
+            wind_display = disp["wind_display"]
+            temp_display = disp["temp_display"]
+            popup_html = head
+            if ts_utc: popup_html += f"<br>UTC: {ts_utc}"
+            if ts_local: popup_html += f"<br>Local: {ts_local}"
+            popup_html += tail
             rows.append({
                 "site_id": site_id,
                 "layer": "weather",
@@ -200,22 +222,20 @@ def build_gis_map_inputs_df(
 
     # --- Stations layer ---
     if stations_df is not None and not stations_df.empty:
-        for _, s in stations_df.iterrows():
+        st_popups = (
+            "<b>" + _str_col(stations_df, "name", "Station") + "</b><br>" + _latlon_col(stations_df)
+            + "<br>Type: " + _str_col(stations_df, "type", "N/A")
+            + "<br>Waves: " + _str_col(stations_df, "wave_height_display", "None")
+            + "<br>Wind: " + _str_col(stations_df, "wind_display", "None")
+            + "<br>Temp: " + _str_col(stations_df, "temp_display", "None")
+        )
+        for s, popup_html in zip(stations_df.to_dict("records"), st_popups.tolist()):
             lat = s.get("lat_dd")
             lon = s.get("lon_dd")
             label = s.get("name", "Station")
             wave_display = s.get("wave_height_display", "None")
             wind_display = s.get("wind_display", "None")
             temp_display = s.get("temp_display", "None")
-            popup_fields = [
-                f"<b>{label}</b>",
-                _latlon_str(lat, lon),
-                f"Type: {s.get('type','N/A')}",
-                f"Waves: {wave_display}",
-                f"Wind: {wind_display}",
-                f"Temp: {temp_display}"
-            ]
-            popup_html = "<br>".join(popup_fields)
             rows.append({
                 "site_id": site_id,
                 "layer": "station",
@@ -246,7 +266,7 @@ def build_gis_map_inputs_df(
         sat_items = []
         if isinstance(sat_overlays, pd.DataFrame):
             # Convert rows → overlay dicts (Circle, LineString, Point)
-            for _, r in sat_overlays.iterrows():
+            for r in sat_overlays.to_dict("records"):
                 role = str(r.get("role") or "")
                 style = _sat_style_for_role(role)
                 label = str(r.get("sat_name") or "Satellite")
@@ -399,7 +419,7 @@ def build_gis_map_inputs_df(
 
         if _sat_df is not None and not _sat_df.empty:
             # Footprint circle (guardrail: require center + radius)
-            for _, r in _sat_df.iterrows():
+            for r in _sat_df.to_dict("records"):
                 # Footprint circle
                 lat = r.get('lat_dd'); lon = r.get('lon_dd'); rad_km = r.get('footprint_radius_km')
                 if pd.notna(lat) and pd.notna(lon) and pd.notna(rad_km):
@@ -575,6 +595,10 @@ def build_gis_map_inputs_df(
     if 'geometry' in df_out.columns:
         df_out['geometry'] = df_out['geometry'].apply(_norm_geom)
 
+    # Enum-like columns as categoricals: the renderer groups on integer codes, not per-row strings
+    for col in ('layer', 'geom_type'):
+        df_out[col] = df_out[col].astype('category')
+
     return df_out
 
 # --- SAT role→style mapping for renderer (Folium expects these keys) ---
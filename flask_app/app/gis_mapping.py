@@ -24,18 +24,25 @@ Next step: Add generate_gis_map_html_from_dfs(positions_df, ...) (DF inputs, lay
 #gis_mapping.py
 
 
-import os, math, logging, base64
+import os, math, logging, base64, hashlib, json, shutil, gzip, pickle, threading, time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 import numpy as np
 import pandas as pd
 from typing import Optional
-from app.utils_display import format_us_display, to_dual_time, derive_local_tz
+from app.utils_display import format_us_display, format_us_display_vec, to_dual_time, derive_local_tz
 from app.setup_imports import *
 from app.utils import log_error_and_continue
 import folium
 import geopandas as gpd
 from folium import DivIcon
+from folium.plugins import FastMarkerCluster
 import traceback
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Polygon as MplPolygon
 from app.utils_coordinates import to_latlon_polyline
 
 
@@ -45,10 +52,42 @@ try:
 except Exception:
     HAS_PROJ = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+import shapely
 from shapely.geometry import Point
+from jinja2 import Template
 
 DEBUG_MARKERS = os.getenv("RDS_DEBUG_MARKERS", "0") == "1"
 ICON_MODE = os.getenv("RDS_ICON_MODE", "base64").lower()
+MAP_CACHE_ENABLED = os.getenv("RDS_MAP_CACHE", "1") == "1"
+MAP_CACHE_TTL_S = float(os.getenv("RDS_MAP_CACHE_TTL_S", "86400"))  # cached map lifetime (0 = no expiry)
+MAP_CACHE_MAX_FILES = int(os.getenv("RDS_MAP_CACHE_MAX", "512"))  # newest cached maps kept on disk (0 = no cap)
+# Bump whenever the map renderers/templates change their output (part of every cache key)
+MAP_RENDER_VERSION = "2"
+MAP_HTML_LRU_SIZE = int(os.getenv("RDS_MAP_HTML_LRU", "16"))  # rendered DF maps kept in memory (0 = off)
+COASTLINE_BBOX_PAD_DEG = float(os.getenv("RDS_COASTLINE_PAD_DEG", "10"))  # coastline read window around A/B
+COASTLINE_SIMPLIFY_DEG = float(os.getenv("RDS_COASTLINE_SIMPLIFY_DEG", "0.01"))  # Douglas-Peucker tolerance (0 = off)
+# Optional pre-rendered coastline XYZ tiles (e.g. "/tiles/coastline/{z}/{x}/{y}.png"); when set, the
+# coastline is drawn by the browser from tiles instead of being read from the shapefile and embedded.
+COASTLINE_TILES_URL = os.getenv("RDS_COASTLINE_TILES_URL", "").strip()
+# DF maps: write satellite tracks to <map>.sat_tracks_<leo|meo|geo>.geojson next to the HTML and let the
+# browser fetch them after load instead of inlining them (needs the map served over HTTP, e.g. /maps/...)
+SAT_GEOJSON_EXTERNAL = os.getenv("RDS_SAT_GEOJSON_EXTERNAL", "0") == "1"
+# Store generated maps gzip-compressed at rest (<name>.html.gz, served with Content-Encoding: gzip)
+MAP_GZIP = os.getenv("RDS_MAP_GZIP", "0") == "1"
+# Data paths resolved once at import (RDS_DATA_FOLDER is fixed for the life of the process)
+_DATA_FOLDER = Path(os.getenv('RDS_DATA_FOLDER', 'C:/Users/gehig/Projects/RescueDecisionSystems/data'))
+_COASTLINE_PATH = _DATA_FOLDER / 'shapefiles' / 'coastline' / 'ne_10m_coastline.shp'
+_MAP_CACHE_DIR = Path(os.getenv('RDS_MAP_CACHE_DIR', _DATA_FOLDER / 'maps' / 'cache'))
+# Pickled, pre-simplified coastline (rebuilt when missing or older than the shapefile)
+_COASTLINE_PICKLE = Path(os.getenv(
+    'RDS_COASTLINE_PICKLE',
+    _COASTLINE_PATH.with_name(f"ne_10m_coastline.simplified_{COASTLINE_SIMPLIFY_DEG:g}.pkl")))
 
 # --- ICON RESOLVER ---
 ICON_FILES = {
@@ -96,6 +135,47 @@ def _icon_relpath_for_key(icon_key: str, map_out_path: str) -> Optional[str]:
         return None
 # --- END ICON RESOLVER ---
 
+# --- MARKER ICON TEMPLATES ---
+ICON_SPECS = {
+    "alert":    {"color": "red", "icon": "info-sign"},
+    "wx_shore": {"color": "green", "icon": "cloud"},
+    "wx_other": {"color": "blue", "icon": "cloud"},
+    "wx_alert": {"color": "orange", "icon": "exclamation-triangle"},
+}
+LABEL_DIV_HTML = '<div style="font-size: 14pt; color: red; font-weight: bold">{label}</div>'
+# Same text style for A/B labels drawn as permanent tooltips on the marker (DF-based map)
+AB_LABEL_TOOLTIP_STYLE = ("font-size: 14pt; color: red; font-weight: bold; "
+                          "background: none; border: none; box-shadow: none;")
+# folium>=0.19 declares an icon once and calls setIcon() per marker, so one Icon can back many
+# markers. Older folium re-parents the icon on each add, so it needs one instance per marker.
+_SHARED_ICONS_OK = hasattr(folium.Marker, "SetIcon")
+
+class _MapIcons:
+    """
+    Per-render icon cache: one folium Icon per ICON_SPECS kind and one DivIcon per label,
+    reused by every marker on the map. Create one per map (instances are not shared across
+    renders, so concurrent map jobs never touch the same Icon objects).
+    """
+    def __init__(self):
+        self._icons = {}
+
+    def icon(self, kind):
+        if not _SHARED_ICONS_OK:
+            return folium.Icon(**ICON_SPECS[kind])
+        if kind not in self._icons:
+            self._icons[kind] = folium.Icon(**ICON_SPECS[kind])
+        return self._icons[kind]
+
+    def label(self, text):
+        key = ("label", text)
+        if not _SHARED_ICONS_OK or key not in self._icons:
+            div = DivIcon(icon_size=(150, 36), icon_anchor=(0, 0), html=LABEL_DIV_HTML.format(label=text))
+            if not _SHARED_ICONS_OK:
+                return div
+            self._icons[key] = div
+        return self._icons[key]
+# --- END MARKER ICON TEMPLATES ---
+
 def first_notna(row, keys):
     for k in keys:
         v = row.get(k, np.nan)
@@ -103,6 +183,22 @@ def first_notna(row, keys):
             return v
     return None
 
+def _first_notna_col(df, keys):
+    """Column-wise first_notna(): per row, the first non-null value across the present keys."""
+    present = [k for k in keys if k in df.columns]
+    if not present:
+        return pd.Series(np.nan, index=df.index, dtype=object)
+    out = df[present[0]].astype(object)
+    for k in present[1:]:
+        out = out.where(out.notna(), df[k].astype(object))
+    return out
+
+def _str_col(df, col, default):
+    """str() of a whole column; default where the column or the value is missing."""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].astype(str).where(df[col].notna(), default)
+
 def get_lat_lon(row):
     lat = first_notna(row, ["lat", "latitude", "lat_dd", "latitude_dd"])
     lon = first_notna(row, ["lon", "longitude", "lon_dd", "longitude_dd"])
@@ -139,23 +235,268 @@ def _fmt_num(v, prec=5, dash="—"):
     except Exception:
         return dash
 
+COORD_DECIMALS = 5  # ~1 m; coordinates written into map HTML/GeoJSON are rounded to this
+
+def _has_value(v):
+    """Scalar not-missing check for per-row/per-vertex loops: not None and not NaN (NaN != NaN)."""
+    return v is not None and v == v
+
+def _q(x):
+    """Quantize a coordinate for emitted HTML (shorter numbers, no visible change)."""
+    return round(float(x), COORD_DECIMALS)
+
+def _nan_bounds(lats, lons):
+    """(min_lat, max_lat, min_lon, max_lon) ignoring NaN/None, or None when either axis has no values."""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    if np.isnan(lats).all() or np.isnan(lons).all():
+        return None
+    return np.nanmin(lats), np.nanmax(lats), np.nanmin(lons), np.nanmax(lons)
+
+# Weather-station record keys read by generate_gis_map() (including the alias spellings)
+_WX_COLS = [
+    "station_id", "station_name", "source", "owner", "deployment_notes", "distance_nm", "timelate",
+    "lat", "latitude", "lat_dd", "latitude_dd", "lon", "longitude", "lon_dd", "longitude_dd",
+    "temp_C", "temperature", "temp_c", "wind_ms", "wind_speed", "wave_m", "wave_height", "wave_height_m",
+    "ts_utc", "obs_time",
+]
+
+# Alert fields that fully determine generate_gis_map() output (used for the HTML cache key)
+_GIS_MAP_CACHE_FIELDS = (
+    "site_id", "latitude_a", "longitude_a", "latitude_b", "longitude_b",
+    "range_ring_meters_a", "range_ring_meters_b",
+    "nearest_weather_stations_a", "nearest_weather_stations_b", "weather_alerts",
+)
+
+def _gis_map_cache_key(alert_row) -> str:
+    """
+    Content hash (blake2b) of the alert fields rendered by generate_gis_map().
+    Same alert payload → same key → same HTML, so the rendered file can be reused.
+    """
+    payload = [(k, alert_row.get(k)) for k in _GIS_MAP_CACHE_FIELDS] + [
+        ("render_version", MAP_RENDER_VERSION),
+        ("coastline_tiles", COASTLINE_TILES_URL),
+        ("coastline_simplify_deg", COASTLINE_SIMPLIFY_DEG),
+        ("coastline_pad_deg", COASTLINE_BBOX_PAD_DEG),
+        ("icon_mode", ICON_MODE),
+        ("operator_tz", os.getenv("RDS_OPERATOR_TZ")),  # read at render time for the station Obs Time popups
+    ]
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+# One background thread for coastline reads: overlaps them with marker/popup building and keeps the
+# first _load_coastline() (shapefile parse or pickle load) from running twice at once
+_COASTLINE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rds-coast")
+
+def _reset_coastline_executor():
+    # A forked child (generate_gis_maps workers) inherits the executor but not its thread
+    global _COASTLINE_EXECUTOR
+    _COASTLINE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rds-coast")
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_coastline_executor)
+
+@lru_cache(maxsize=1)
+def _load_coastline():
+    """
+    Full coastline, geometry only, simplified by COASTLINE_SIMPLIFY_DEG (Douglas-Peucker).
+    Loaded from _COASTLINE_PICKLE when it is newer than the shapefile; otherwise the shapefile is
+    parsed once, simplified and pickled for the next process. Cached per process (read-only).
+    """
+    try:
+        if _COASTLINE_PICKLE.stat().st_mtime >= _COASTLINE_PATH.stat().st_mtime:
+            with open(_COASTLINE_PICKLE, "rb") as fh:
+                return pickle.load(fh)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"[RDS] Coastline pickle unreadable ({e}); rebuilding from shapefile.")
+
+    gdf = gpd.read_file(_COASTLINE_PATH, engine="pyogrio", columns=[])
+    gdf = gdf[gdf.geom_type.isin(["LineString", "MultiLineString"])]
+    if COASTLINE_SIMPLIFY_DEG > 0:
+        gdf = gpd.GeoDataFrame(
+            geometry=shapely.simplify(gdf.geometry.values, COASTLINE_SIMPLIFY_DEG, preserve_topology=False),
+            crs=gdf.crs)
+    try:
+        tmp = _COASTLINE_PICKLE.with_name(f"{_COASTLINE_PICKLE.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(gdf, fh, protocol=4)
+        os.replace(tmp, _COASTLINE_PICKLE)  # atomic: concurrent workers never see a partial pickle
+        logging.info(f"[RDS] Coastline pickle written: {_COASTLINE_PICKLE}")
+    except Exception as e:
+        logging.warning(f"[RDS] Could not write coastline pickle {_COASTLINE_PICKLE}: {e}")
+    return gdf
+
+@lru_cache(maxsize=16)
+def _read_coastline(bbox):
+    """
+    Coastline LineStrings inside bbox (minx, miny, maxx, maxy), clipped to the bbox so far fewer
+    vertices reach the HTML. Cut from the cached, simplified _load_coastline() set.
+    Cached per process; callers snap bbox to whole degrees so nearby alerts share an entry.
+    Treat the returned GeoDataFrame as read-only.
+    """
+    coast = _load_coastline()
+    hits = coast.sindex.query(shapely.box(*bbox))
+    geoms = shapely.clip_by_rect(coast.geometry.values[np.sort(hits)], *bbox)
+    gdf = gpd.GeoDataFrame(geometry=geoms[~shapely.is_empty(geoms)], crs=coast.crs)
+    # Clipping can split a line into a MultiLineString (or leave a touching Point); render wants
+    # plain LineStrings only, so explode and filter here once instead of per feature
+    gdf = gdf.explode(index_parts=False, ignore_index=True)
+    return gdf[gdf.geom_type == "LineString"].reset_index(drop=True)
+
+def _json_dumps(obj) -> str:
+    """Compact JSON text; orjson (numpy arrays serialized natively) when installed, else stdlib json."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=lambda a: a.tolist())
+
+class _GeoJsonText(folium.MacroElement):
+    """
+    L.geoJson layer from GeoJSON already serialized to text. folium.GeoJson re-parses string
+    input and re-dumps it (plus per-feature style_function calls), so large static layers like
+    the coastline are encoded once here with _json_dumps instead.
+    """
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson({{ this.data }}, {style: {{ this.style }}}).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, style=None):
+        super().__init__()
+        self._name = "GeoJson"
+        self.data = data if isinstance(data, str) else _json_dumps(data)
+        self.style = _json_dumps(style or {})
+
+class _GeoJsonUrl(folium.MacroElement):
+    """
+    L.geoJson layer whose data the browser fetches from url after the page loads (nothing inlined).
+    Same feature conventions as _geojson_layer(): properties "label" (tooltip), "popup_html" and an
+    optional "style" merged over the default style.
+    """
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson(null, {
+            style: function (f) { return Object.assign({}, {{ this.style }}, f.properties.style || {}); },
+            onEachFeature: function (f, layer) {
+                if (f.properties.label) { layer.bindTooltip(String(f.properties.label)); }
+                if (f.properties.popup_html) { layer.bindPopup(f.properties.popup_html); }
+            }
+        }).addTo({{ this._parent.get_name() }});
+        fetch({{ this.url }})
+            .then(function (r) { return r.json(); })
+            .then(function (data) { {{ this.get_name() }}.addData(data); });
+        {% endmacro %}
+    """)
+
+    def __init__(self, url, style=None):
+        super().__init__()
+        self._name = "GeoJsonUrl"
+        self.url = _json_dumps(url)
+        self.style = _json_dumps(style or {})
+
+def _map_cache_fresh(path) -> bool:
+    """True if a cached map exists and is younger than MAP_CACHE_TTL_S (expired files are misses)."""
+    try:
+        age = time.time() - path.stat().st_mtime
+    except OSError:
+        return False
+    return MAP_CACHE_TTL_S <= 0 or age < MAP_CACHE_TTL_S
+
+def _write_map_cache(cache_path, write):
+    """
+    Atomically publish a cache entry: write(tmp_path) fills a temp file next to cache_path, which
+    is then os.replace()d into place, so readers never see a partial file. Prunes the cache after.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    _prune_map_cache()
+
+def _prune_map_cache():
+    """Best effort: drop entries older than MAP_CACHE_TTL_S, then the oldest beyond MAP_CACHE_MAX_FILES."""
+    now = time.time()
+    entries = []
+    try:
+        for p in _MAP_CACHE_DIR.iterdir():
+            try:
+                mtime = p.stat().st_mtime
+                if MAP_CACHE_TTL_S > 0 and now - mtime >= MAP_CACHE_TTL_S:
+                    p.unlink()
+                elif p.suffix != ".tmp":  # in-flight writes only expire via the TTL
+                    entries.append((mtime, p))
+            except OSError:
+                continue
+        if MAP_CACHE_MAX_FILES > 0 and len(entries) > MAP_CACHE_MAX_FILES:
+            entries.sort()
+            for _, p in entries[:len(entries) - MAP_CACHE_MAX_FILES]:
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+    except OSError as e:
+        logging.warning(f"[RDS] Map cache prune skipped: {e}")
+
+def _drop_stale_variant(path):
+    """Remove the other variant of a saved map (<name>.html vs <name>.html.gz) so only the fresh one is served."""
+    path = os.fspath(path)
+    other = path[:-3] if path.endswith(".gz") else path + ".gz"
+    try:
+        os.remove(other)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"[RDS] Could not remove stale map variant {other}: {e}")
+
+def _save_map(m, path, gz=None):
+    """
+    Write a folium map to path. gz=True writes through gzip (level 6); by default that is decided
+    by the path ending in .gz (pass gz explicitly for temp paths). Drops the stale other variant.
+    """
+    path = os.fspath(path)
+    if gz is None:
+        gz = path.endswith(".gz")
+    if not gz:
+        m.save(path)
+    else:
+        html = m.get_root().render()
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as fh:
+            fh.write(html)
+    _drop_stale_variant(path)
+
 def generate_gis_map(alert_row, save_path):
     """
     Generates GIS map showing SARSAT alert locations (A/B), weather stations, range rings, and weather alerts.
+    Rendered HTML is cached under <RDS_DATA_FOLDER>/maps/cache/<hash>.html (override with RDS_MAP_CACHE_DIR,
+    disable with RDS_MAP_CACHE=0); a fresh hit (RDS_MAP_CACHE_TTL_S) is copied to save_path without re-rendering.
+    Maps rendered without their coastline (read failure) are not cached.
+    With RDS_MAP_GZIP=1 the map is written as <save_path>.gz and that path is returned.
     """
-    logging.warning(f"ðŸ—ºï¸ generate_gis_map() called â€” context: {traceback.format_stack(limit=3)}")
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("generate_gis_map() called — context: %s", traceback.format_stack(limit=3))
 
     site_id = str(alert_row['site_id'])  # âœ… Force site_id to string to avoid int64 serialization issues
 
-    base_data_path = os.getenv('RDS_DATA_FOLDER', 'C:/Users/gehig/Projects/RescueDecisionSystems/data')
-    coastline_shapefile = os.path.join(base_data_path, 'shapefiles', 'coastline', 'ne_10m_coastline.shp')
+    if MAP_GZIP:
+        save_path = f"{os.fspath(save_path)}.gz"
 
-    try:
-        gdf_coastline = gpd.read_file(coastline_shapefile)
-        logging.info(f"âœ… Loaded coastline shapefile: {coastline_shapefile}")
-    except Exception as e:
-        log_error_and_continue(f"âš ï¸ Failed to load coastline shapefile: {e}")
-        gdf_coastline = None
+    cache_path = None
+    if MAP_CACHE_ENABLED:
+        cache_path = _MAP_CACHE_DIR / f"{_gis_map_cache_key(alert_row)}.html{'.gz' if MAP_GZIP else ''}"
+        if _map_cache_fresh(cache_path):
+            shutil.copyfile(cache_path, save_path)
+            _drop_stale_variant(save_path)
+            logging.info(f"[RDS] GIS map cache hit for {site_id}: {cache_path}")
+            return save_path
 
     center_lat = alert_row['latitude_a'] if pd.notna(alert_row['latitude_a']) else alert_row['latitude_b']
     center_lon = alert_row['longitude_a'] if pd.notna(alert_row['longitude_a']) else alert_row['longitude_b']
@@ -164,24 +505,54 @@ def generate_gis_map(alert_row, save_path):
         logging.warning("âš ï¸ No valid position available for map generation.")
         return None
 
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
+    combined_weather_stations = []
+    if 'nearest_weather_stations_a' in alert_row and alert_row['nearest_weather_stations_a']:
+        combined_weather_stations.extend(alert_row['nearest_weather_stations_a'])
+    if 'nearest_weather_stations_b' in alert_row and alert_row['nearest_weather_stations_b']:
+        combined_weather_stations.extend(alert_row['nearest_weather_stations_b'])
+
+    has_wx_alerts = bool('weather_alerts' in alert_row and alert_row['weather_alerts'])
+    has_rings = any(pd.notna(r) and r > 0 for r in (alert_row['range_ring_meters_a'], alert_row['range_ring_meters_b']))
+
+    gdf_coastline = coastline_future = None
+    coastline_failed = False
+    if not combined_weather_stations and not has_wx_alerts and not has_rings:
+        # Fast path: position markers only, so skip the coastline read (base tiles already show the shore)
+        logging.info(f"[RDS] GIS map for {site_id} has no stations/alerts/rings; skipping coastline overlay")
+    elif COASTLINE_TILES_URL:
+        logging.info(f"[RDS] Using coastline tiles: {COASTLINE_TILES_URL}")
+    else:
+        # Read only the coastline around the alert (GDAL-side bbox filter, geometry only)
+        lats = [v for v in (alert_row['latitude_a'], alert_row['latitude_b']) if pd.notna(v)]
+        lons = [v for v in (alert_row['longitude_a'], alert_row['longitude_b']) if pd.notna(v)]
+        coastline_bbox = (math.floor(min(lons) - COASTLINE_BBOX_PAD_DEG), math.floor(min(lats) - COASTLINE_BBOX_PAD_DEG),
+                          math.ceil(max(lons) + COASTLINE_BBOX_PAD_DEG), math.ceil(max(lats) + COASTLINE_BBOX_PAD_DEG))
+        # Read on the coastline thread (pickle I/O + GEOS clip release the GIL) while the markers
+        # and popups below are built on this one; joined just before the coastline layer is added
+        coastline_future = _COASTLINE_EXECUTOR.submit(_read_coastline, coastline_bbox)
+
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=6, prefer_canvas=True)
+
+    icons = _MapIcons()
+    # Markers go into one FeatureGroup per layer (one child on the map each) instead of the map itself
+    positions_fg = folium.FeatureGroup(name="Alert Positions").add_to(m)
+    stations_fg = folium.FeatureGroup(name="Weather Stations").add_to(m)
+    wx_alerts_fg = folium.FeatureGroup(name="Weather Alerts").add_to(m)
 
     def add_position_marker(lat, lon, range_ring, label):
         if pd.notna(lat) and pd.notna(lon):
+            popup = f"{label} Location<br>{_fmt_num(lat, 5)}, {_fmt_num(lon, 5)}"
+            lat, lon = _q(lat), _q(lon)
             folium.Marker(
                 location=[lat, lon],
-                popup=f"{label} Location<br>{_fmt_num(lat, 5)}, {_fmt_num(lon, 5)}",
-                icon=folium.Icon(color="red", icon="info-sign")
-            ).add_to(m)
+                popup=popup,
+                icon=icons.icon("alert")
+            ).add_to(positions_fg)
 
             folium.map.Marker(
                 [lat, lon],
-                icon=DivIcon(
-                    icon_size=(150, 36),
-                    icon_anchor=(0, 0),
-                    html=f'<div style="font-size: 14pt; color: red; font-weight: bold">{label}</div>',
-                )
-            ).add_to(m)
+                icon=icons.label(label)
+            ).add_to(positions_fg)
 
             if range_ring and range_ring > 0:
                 folium.Circle(
@@ -190,122 +561,173 @@ def generate_gis_map(alert_row, save_path):
                     color='red',
                     fill=True,
                     fill_opacity=0.2
-                ).add_to(m)
+                ).add_to(positions_fg)
 
     add_position_marker(alert_row['latitude_a'], alert_row['longitude_a'], alert_row['range_ring_meters_a'], "A")
     add_position_marker(alert_row['latitude_b'], alert_row['longitude_b'], alert_row['range_ring_meters_b'], "B")
 
-    combined_weather_stations = []
-    if 'nearest_weather_stations_a' in alert_row and alert_row['nearest_weather_stations_a']:
-        combined_weather_stations.extend(alert_row['nearest_weather_stations_a'])
-    if 'nearest_weather_stations_b' in alert_row and alert_row['nearest_weather_stations_b']:
-        combined_weather_stations.extend(alert_row['nearest_weather_stations_b'])
-
-    weather_stations_df = pd.DataFrame(combined_weather_stations)
+    # Fixed columns: no per-record key union / dtype inference, and every alias key is always present
+    weather_stations_df = pd.DataFrame.from_records(combined_weather_stations, columns=_WX_COLS)
 
     if not weather_stations_df.empty:
-        for _, station in weather_stations_df.iterrows():
-            lat, lon = get_lat_lon(station)
-            if lat is None or lon is None:
-                continue
+        # Pre-format every popup column once, then the loop below only places markers
+        ws = weather_stations_df
+        ws_lat = _first_notna_col(ws, ["lat", "latitude", "lat_dd", "latitude_dd"])
+        ws_lon = _first_notna_col(ws, ["lon", "longitude", "lon_dd", "longitude_dd"])
+        raw_temp_C = _first_notna_col(ws, ["temp_C", "temperature", "temp_c"])
+        raw_wind_ms = _first_notna_col(ws, ["wind_ms", "wind_speed"])
+        raw_wave_height_m = _first_notna_col(ws, ["wave_m", "wave_height", "wave_height_m"])
+
+        displays = format_us_display_vec(raw_wave_height_m, raw_wind_ms, raw_temp_C)
+        wave_txt = displays["wave_height_display"]
+        wind_txt = displays["wind_display"]
+        temp_txt = displays["temp_display"]
+
+        op_tz = os.getenv("RDS_OPERATOR_TZ")
+        obs_time = _first_notna_col(ws, ["ts_utc", "obs_time"])
+        time_txt = pd.Series([
+            " / ".join(to_dual_time(t, derive_local_tz(la, lo, op_tz))) if pd.notna(t) and t != "" else ""
+            for t, la, lo in zip(obs_time, ws_lat, ws_lon)
+        ], index=ws.index, dtype=object)
+
+        timelate = ws["timelate"].astype(str).where(ws["timelate"].notna(), "") if "timelate" in ws.columns else ""
+        source = _str_col(ws, "source", "N/A")
+
+        popup_html = (
+            "Station: " + _str_col(ws, "station_id", "Unknown") + " (" + _str_col(ws, "station_name", "N/A") + ")<br>"
+            + "Temp: " + temp_txt + "<br>"
+            + "Wind: " + wind_txt + "<br>"
+            + "Waves: " + wave_txt + "<br>"
+            + "Distance: " + _str_col(ws, "distance_nm", "N/A") + " NM<br>"
+            + "Timelate (hrs): " + timelate + "<br>"
+            + "Source: " + source + "<br>"
+            + "Owner: " + _str_col(ws, "owner", "N/A") + "<br>"
+            + "deployment_notes: " + _str_col(ws, "deployment_notes", "N/A") + "<br>"
+            + "Obs Time: " + time_txt
+        )
+        marker_kind = np.where(source == "shore", "wx_shore", "wx_other")
+
+        # One clustered layer: the page carries [lat, lon, popup, kind] rows and Leaflet builds the
+        # markers client-side, instead of a folium Marker (and its JS block) per station
+        has_pos = (ws_lat.notna() & ws_lon.notna()).to_numpy()
+        data = [[_q(lat), _q(lon), popup_content, kind]
+                for lat, lon, popup_content, kind in zip(ws_lat[has_pos], ws_lon[has_pos],
+                                                         popup_html[has_pos], marker_kind[has_pos])]
+        if data:
+            icon_opts = {kind: {"markerColor": ICON_SPECS[kind]["color"], "iconColor": "white",
+                                "icon": ICON_SPECS[kind]["icon"], "prefix": "glyphicon"}
+                         for kind in ("wx_shore", "wx_other")}
+            FastMarkerCluster(data, callback=_STATION_CLUSTER_CALLBACK % json.dumps(icon_opts)).add_to(stations_fg)
 
-            # Weather stations block
-            raw_temp_C= first_notna(station, ["temp_C", "temperature", "temp_c"])
-            raw_wind_ms = first_notna(station, ["wind_ms", "wind_speed"])
-            raw_wave_height_m= first_notna(station, ["wave_m", "wave_height", "wave_height_m"])
-
-            display = format_us_display(wave_height_m=raw_wave_height_m, wind_ms=raw_wind_ms, temp_C=raw_temp_C)
-            wave_txt = display.get("wave_height_display", "N/A")
-            wind_txt = display.get("wind_display", "N/A")
-            temp_txt = display.get("temp_display", "N/A")
-
-            obs_time = station.get("ts_utc") or station.get("obs_time")
-            time_txt = ""
-            if obs_time:
-                tz = derive_local_tz(lat, lon, os.getenv("RDS_OPERATOR_TZ"))
-                utc_iso, local_iso = to_dual_time(obs_time, tz)
-                time_txt = f"{utc_iso} / {local_iso}"
-
-            timelate = station.get("timelate")
-            if pd.isna(timelate):
-                timelate = ""
-
-            station_id = str(station.get('station_id', 'Unknown'))
-            station_name = str(station.get('station_name', 'N/A'))
-            distance_nm = str(station.get('distance_nm', 'N/A'))
-            source = str(station.get('source', 'N/A'))
-            owner = str(station.get('owner', 'N/A'))
-            notes = str(station.get('deployment_notes', 'N/A'))
-
-            popup_content = (
-                f"Station: {station_id} ({station_name})<br>"
-                f"Temp: {temp_txt}<br>"
-                f"Wind: {wind_txt}<br>"
-                f"Waves: {wave_txt}<br>"
-                f"Distance: {distance_nm} NM<br>"
-                f"Timelate (hrs): {timelate}<br>"
-                f"Source: {source}<br>"
-                f"Owner: {owner}<br>"
-                f"deployment_notes: {notes}<br>"
-                f"Obs Time: {time_txt}"
+    if 'weather_alerts' in alert_row and alert_row['weather_alerts']:
+        # Already a list of dicts: read them directly (no DataFrame round trip)
+        for alert in alert_row['weather_alerts']:
+            headline = str(alert.get('headline', 'N/A'))
+            event = str(alert.get('event', 'N/A'))
+            severity = str(alert.get('severity', 'N/A'))
+            certainty = str(alert.get('certainty', 'N/A'))
+            effective = str(alert.get("effective", "N/A"))
+            expires   = str(alert.get("expires", "N/A"))
+
+            effective_txt = effective
+            expires_txt   = expires
+
+            if effective and effective != "N/A":
+                utc_eff, local_eff = to_dual_time(effective, "UTC")
+                effective_txt = f"{utc_eff} / {local_eff}"
+
+            if expires and expires != "N/A":
+                utc_exp, local_exp = to_dual_time(expires, "UTC")
+                expires_txt = f"{utc_exp} / {local_exp}"
+
+            popup = (
+                f"Alert: {headline}<br>"
+                f"Event: {event}<br>"
+                f"Severity: {severity}<br>"
+                f"Certainty: {certainty}<br>"
+                f"Effective: {effective_txt}<br>"
+                f"Expires: {expires_txt}"
             )
 
-            color = 'green' if source == 'shore' else 'blue'
-
             folium.Marker(
-                location=[lat, lon],
-                popup=popup_content,
-                icon=folium.Icon(color=color, icon="cloud")
-            ).add_to(m)
+                location=[_q(center_lat), _q(center_lon)],
+                popup=popup,
+                icon=icons.icon("wx_alert")
+            ).add_to(wx_alerts_fg)
 
-    if 'weather_alerts' in alert_row and alert_row['weather_alerts']:
-        weather_alerts_df = pd.DataFrame(alert_row['weather_alerts'])
-        if not weather_alerts_df.empty:
-            for _, alert in weather_alerts_df.iterrows():
-                headline = str(alert.get('headline', 'N/A'))
-                event = str(alert.get('event', 'N/A'))
-                severity = str(alert.get('severity', 'N/A'))
-                certainty = str(alert.get('certainty', 'N/A'))
-                effective = str(alert.get("effective", "N/A"))
-                expires   = str(alert.get("expires", "N/A"))
-
-                effective_txt = effective
-                expires_txt   = expires
-
-                if effective and effective != "N/A":
-                    utc_eff, local_eff = to_dual_time(effective, "UTC")
-                    effective_txt = f"{utc_eff} / {local_eff}"
-
-                if expires and expires != "N/A":
-                    utc_exp, local_exp = to_dual_time(expires, "UTC")
-                    expires_txt = f"{utc_exp} / {local_exp}"
-
-                popup = (
-                    f"Alert: {headline}<br>"
-                    f"Event: {event}<br>"
-                    f"Severity: {severity}<br>"
-                    f"Certainty: {certainty}<br>"
-                    f"Effective: {effective_txt}<br>"
-                    f"Expires: {expires_txt}"
-                )
-
-                folium.Marker(
-                    location=[center_lat, center_lon],
-                    popup=popup,
-                    icon=folium.Icon(color='orange', icon='exclamation-triangle')
-                ).add_to(m)
-
-    if gdf_coastline is not None:
-        for _, row in gdf_coastline.iterrows():
-            if row.geometry.geom_type == 'LineString':
-                coords = [[pt[1], pt[0]] for pt in list(row.geometry.coords)]
-                folium.PolyLine(coords, color='black', weight=1).add_to(m)
-
-    m.save(save_path)
+    if coastline_future is not None:
+        try:
+            gdf_coastline = coastline_future.result()
+            logging.info(f"âœ… Loaded coastline shapefile: {_COASTLINE_PATH}")
+        except Exception as e:
+            log_error_and_continue(f"âš ï¸ Failed to load coastline shapefile: {e}")
+            gdf_coastline = None
+            coastline_failed = True
+
+    if COASTLINE_TILES_URL:
+        folium.TileLayer(
+            tiles=COASTLINE_TILES_URL,
+            attr="Natural Earth coastline",
+            name="Coastline",
+            overlay=True,
+            control=False,
+        ).add_to(m)
+    elif gdf_coastline is not None and not gdf_coastline.empty:
+        # All coastline lines as one MultiLineString feature → a single L.geoJSON layer in the page
+        lines = gdf_coastline.geometry.values  # LineStrings only (see _read_coastline)
+        coords_arr = np.round(shapely.get_coordinates(lines), COORD_DECIMALS)  # GeoJSON [lon, lat]
+        splits = np.cumsum(shapely.get_num_coordinates(lines))[:-1]
+        coastline_geojson = {
+            "type": "Feature",
+            "properties": {},
+            "geometry": {"type": "MultiLineString",
+                         "coordinates": np.split(coords_arr, splits)},
+        }
+        _GeoJsonText(
+            coastline_geojson,
+            style={"color": "#000", "weight": 1, "fillOpacity": 0},
+        ).add_to(m)
+
+    if cache_path and not coastline_failed:
+        # Render once into the cache, then copy out (next identical alert skips the render)
+        _write_map_cache(cache_path, lambda tmp: _save_map(m, tmp, gz=MAP_GZIP))
+        shutil.copyfile(cache_path, save_path)
+        _drop_stale_variant(save_path)
+    else:
+        _save_map(m, save_path)
     logging.info(f"âœ… Saved GIS map: {save_path}")
 
     return save_path
 
+def _render_one(job):
+    """Process-pool worker for generate_gis_maps(): job = (alert_row, save_path)."""
+    alert_row, save_path = job
+    try:
+        return generate_gis_map(alert_row, save_path)
+    except Exception as e:
+        log_error_and_continue(f"âš ï¸ GIS map failed for {save_path}: {e}")
+        return None
+
+def generate_gis_maps(alert_rows, save_dir, max_workers=None):
+    """
+    Batch generate_gis_map() over many alerts, one process per CPU.
+    alert_rows: DataFrame or iterable of alert rows (Series/dict). Maps go to <save_dir>/gis_map_<site_id>.html.
+    Returns the list of saved paths (None where a map was skipped or failed), in input order.
+    On Windows call this from under `if __name__ == "__main__":` (spawn start method).
+    """
+    if isinstance(alert_rows, pd.DataFrame):
+        alert_rows = alert_rows.to_dict("records")
+    os.makedirs(save_dir, exist_ok=True)
+    jobs = [(row, os.path.join(save_dir, f"gis_map_{row['site_id']}.html")) for row in alert_rows]
+    if not jobs:
+        return []
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [_render_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_one, jobs))
+
 def format_timelate(hours):
     if hours is None or (hasattr(pd, "isna") and pd.isna(hours)):
         return "N/A"
@@ -317,11 +739,31 @@ def format_timelate(hours):
         return f"{int(h * 60)} mins"
     return f"{fmt_num(h, '.2f')} hours"
 
+def format_timelate_series(hours) -> pd.Series:
+    """Vectorized format_timelate() over a Series: same 'N/A' / 'N mins' / 'H.HH hours' strings."""
+    h = pd.to_numeric(pd.Series(hours), errors="coerce")
+    valid = h.notna().to_numpy()
+    mins = np.trunc(h.fillna(0).to_numpy() * 60).astype(np.int64).astype(str)
+    hrs = np.char.mod("%.2f", h.fillna(0).to_numpy())
+    out = np.where(~valid, "N/A",
+                   np.where(h.fillna(0).to_numpy() < 1, np.char.add(mins, " mins"), np.char.add(hrs, " hours")))
+    return pd.Series(out, index=h.index, dtype=object)
+
 def format_hours(hours):
     if hours is None or (hasattr(pd, "isna") and pd.isna(hours)):
         return "—"
     return f"{fmt_num(hours, '.2f')} hours"
 
+@lru_cache(maxsize=256)
+def _aeqd_transformers(lat_q, lon_q):
+    """
+    (forward, inverse) WGS84 <-> AEQD transformers centred on (lat_q, lon_q).
+    Callers pass centres rounded to 3 dp so repeat renders of a site reuse the PROJ objects.
+    """
+    crs_aeqd = CRS.from_proj4(f"+proj=aeqd +lat_0={lat_q} +lon_0={lon_q} +datum=WGS84")
+    return (Transformer.from_crs(4326, crs_aeqd, always_xy=True),
+            Transformer.from_crs(crs_aeqd, 4326, always_xy=True))
+
 def generate_gis_png(alert_row: pd.Series, out_dir: str) -> dict:
     site_id = str(alert_row.get('site_id', 'unknown'))
     lat_a = alert_row.get('position_lat_dd_a')
@@ -335,37 +777,39 @@ def generate_gis_png(alert_row: pd.Series, out_dir: str) -> dict:
     png_path = os.path.join(out_dir, f"rds_map_{site_id}.png")
     geojson_path = os.path.join(out_dir, f"positions_{site_id}.geojson")
 
-    fig, ax = plt.subplots(figsize=(6, 6))
+    # OO API (no pyplot): no global figure registry/lock, so concurrent renders don't serialize
+    fig = Figure(figsize=(6, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     points = []
     labels = []
     rings = []
 
-    # Ensure PROJ is ready once per render
+    # Ensure PROJ is ready (one-shot per process)
     _rds_ensure_proj_ready()
 
     # Helper for ring
     def plot_ring(lat, lon, radius_m, label):
         try:
-            # Try pyproj/CRS logic
-            crs_wgs = CRS.from_epsg(4326)
-            crs_aeqd = CRS.from_proj4(f"+proj=aeqd +lat_0={lat} +lon_0={lon} +datum=WGS84")
-            transformer = Transformer.from_crs(crs_wgs, crs_aeqd, always_xy=True)
-            transformer_inv = Transformer.from_crs(crs_aeqd, crs_wgs, always_xy=True)
+            # Try pyproj/CRS logic (transformers cached per rounded centre)
+            transformer, transformer_inv = _aeqd_transformers(round(float(lat), 3), round(float(lon), 3))
             x0, y0 = transformer.transform(lon, lat)
-            circle = plt.Circle((x0, y0), radius_m, color='red', alpha=0.2, fill=True, lw=1, zorder=1)
-            ax.add_patch(circle)
-            bounds = [transformer_inv.transform(x0 + radius_m, y0), transformer_inv.transform(x0 - radius_m, y0),
-                      transformer_inv.transform(x0, y0 + radius_m), transformer_inv.transform(x0, y0 - radius_m)]
+            # Whole ring in AEQD metres → lon/lat in one array PROJ call (axes are in degrees)
+            ang = np.linspace(0.0, 2.0 * np.pi, 180, endpoint=False)
+            r_lons, r_lats = transformer_inv.transform(x0 + radius_m * np.cos(ang), y0 + radius_m * np.sin(ang))
+            ring = np.column_stack([r_lons, r_lats])
+            ax.add_patch(MplPolygon(ring, closed=True, edgecolor='red', facecolor='red', alpha=0.2, lw=1, zorder=1))
+            # E, W, N, S ring extremes (angles 0, 180, 90, 270 degrees)
+            bounds = [tuple(ring[i]) for i in (0, 90, 45, 135)]
             logging.info(f"[RDS] Range ring for {label} used PROJ/AEQD projection.")
             return bounds
         except Exception as e:
             logging.warning(f"[RDS] pyproj ring failed ({e}); using degree-approx fallback.")
             ring_pts = _rds_ring_lonlat_points(lat, lon, radius_m)
-            from matplotlib.patches import Polygon
-            poly = Polygon(ring_pts, closed=True, edgecolor='red', facecolor='red', alpha=0.2, lw=1, zorder=1)
+            poly = MplPolygon(ring_pts, closed=True, edgecolor='red', facecolor='red', alpha=0.2, lw=1, zorder=1)
             ax.add_patch(poly)
             logging.info(f"[RDS] Range ring for {label} used degree-approximation fallback.")
-            return ring_pts
+            return [tuple(p) for p in ring_pts.tolist()]
 
     # Plot Position A
     if pd.notna(lat_a) and pd.notna(lon_a):
@@ -386,11 +830,9 @@ def generate_gis_png(alert_row: pd.Series, out_dir: str) -> dict:
             rings += plot_ring(lat_b, lon_b, rr_b, 'B')
 
     # Set extent
-    all_lats = [lat for lat in [lat_a, lat_b] if pd.notna(lat)]
-    all_lons = [lon for lon in [lon_a, lon_b] if pd.notna(lon)]
-    if all_lats and all_lons:
-        min_lat, max_lat = min(all_lats), max(all_lats)
-        min_lon, max_lon = min(all_lons), max(all_lons)
+    bounds = _nan_bounds([lat_a, lat_b], [lon_a, lon_b])
+    if bounds is not None:
+        min_lat, max_lat, min_lon, max_lon = bounds
         pad_lat = max(0.01, (max_lat - min_lat) * 0.2)
         pad_lon = max(0.01, (max_lon - min_lon) * 0.2)
         ax.set_xlim(min_lon - pad_lon, max_lon + pad_lon)
@@ -398,9 +840,8 @@ def generate_gis_png(alert_row: pd.Series, out_dir: str) -> dict:
     ax.set_xlabel('Longitude')
     ax.set_ylabel('Latitude')
     ax.set_title(f"RDS Alert Map: {site_id}")
-    plt.tight_layout()
-    plt.savefig(png_path, dpi=150)
-    plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(png_path, dpi=150)
     if logging.getLogger().hasHandlers():
         logging.info(f"âœ… Map image saved: {png_path}")
     else:
@@ -416,7 +857,7 @@ def generate_gis_png(alert_row: pd.Series, out_dir: str) -> dict:
                     'label': labels,
                     'range_ring_meters': [rr_a if l == 'A' else rr_b for l in labels]
                 }, geometry=points, crs="EPSG:4326")
-                gdf.to_file(geojson_path, driver='GeoJSON')
+                gdf.to_file(geojson_path, driver='GeoJSON', COORDINATE_PRECISION=COORD_DECIMALS)
                 geojson_written = True
                 geojson_path_out = geojson_path
                 if logging.getLogger().hasHandlers():
@@ -461,19 +902,19 @@ def generate_gis_map_html(alert_row, out_dir, tiles_mode="online"):
     # Center map on A if present, else B
     center_lat = lat_a if pd.notna(lat_a) else lat_b
     center_lon = lon_a if pd.notna(lon_a) else lon_b
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=8, tiles="OpenStreetMap" if tiles_mode=="online" else None)
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=8, tiles="OpenStreetMap" if tiles_mode=="online" else None, prefer_canvas=True)
 
     # Plot Position A
     if pd.notna(lat_a) and pd.notna(lon_a):
-        folium.Marker([lat_a, lon_a], popup="A", icon=folium.Icon(color="red")).add_to(m)
+        folium.Marker([_q(lat_a), _q(lon_a)], popup="A", icon=folium.Icon(color="red")).add_to(m)
         if rr_a and rr_a > 0:
-            folium.Circle([lat_a, lon_a], radius=rr_a, color="red", fill=True, fill_opacity=0.2, weight=1, popup="A ring").add_to(m)
+            folium.Circle([_q(lat_a), _q(lon_a)], radius=rr_a, color="red", fill=True, fill_opacity=0.2, weight=1, popup="A ring").add_to(m)
 
     # Plot Position B
     if pd.notna(lat_b) and pd.notna(lon_b):
-        folium.Marker([lat_b, lon_b], popup="B", icon=folium.Icon(color="red")).add_to(m)
+        folium.Marker([_q(lat_b), _q(lon_b)], popup="B", icon=folium.Icon(color="red")).add_to(m)
         if rr_b and rr_b > 0:
-            folium.Circle([lat_b, lon_b], radius=rr_b, color="red", fill=True, fill_opacity=0.2, weight=1, popup="B ring").add_to(m)
+            folium.Circle([_q(lat_b), _q(lon_b)], radius=rr_b, color="red", fill=True, fill_opacity=0.2, weight=1, popup="B ring").add_to(m)
 
     m.save(html_path)
     if logging.getLogger().hasHandlers():
@@ -491,10 +932,12 @@ try:
 except Exception:
     pass
 
+@lru_cache(maxsize=1)
 def _rds_ensure_proj_ready() -> Optional[str]:
     """
     Ensure pyproj has a valid PROJ database available.
     Returns the resolved PROJ data directory or None if unresolved.
+    Runs once per process; later calls return the first result without re-probing the filesystem.
     """
     try:
         cur = getattr(datadir, "get_data_dir", lambda: None)()
@@ -530,136 +973,278 @@ def _rds_ensure_proj_ready() -> Optional[str]:
     logging.warning("[RDS] PROJ data dir not resolved; GIS will use degree-approximation fallback for rings.")
     return None
 
+_M_PER_DEG_LAT = 111_320.0  # spherical metres per degree of latitude (degree-approximation paths)
+
 def _rds_ring_lonlat_points(lat_deg: float, lon_deg: float, radius_m: float, n: int = 180):
     """
     Degree-approximation ring (fallback when pyproj CRS fails).
-    Returns list of (lon, lat) points.
-    """
-    lat_per_m = 1.0 / 111_320.0
-    lon_per_m = 1.0 / (111_320.0 * max(0.1, math.cos(math.radians(lat_deg))))
-    pts = []
-    for k in range(n):
-        ang = (2.0 * math.pi * k) / n
-        dlat = radius_m * lat_per_m * math.sin(ang)
-        dlon = radius_m * lon_per_m * math.cos(ang)
-        pts.append((lon_deg + dlon, lat_deg + dlat))
-    pts.append(pts[0])
-    return pts
+    Returns an (n+1, 2) array of (lon, lat) points; the last point closes the ring.
+    """
+    lat_per_m = 1.0 / _M_PER_DEG_LAT
+    lon_per_m = 1.0 / (_M_PER_DEG_LAT * max(0.1, math.cos(math.radians(lat_deg))))
+    ang = np.linspace(0.0, 2.0 * np.pi, n, endpoint=False)
+    pts = np.column_stack([lon_deg + radius_m * lon_per_m * np.cos(ang),
+                           lat_deg + radius_m * lat_per_m * np.sin(ang)])
+    return np.vstack([pts, pts[:1]])
+
+def _ring_polygons(lat_deg, lon_deg, radius_m, k: int = 64):
+    """
+    Degree-approximation rings for N centres at once: an (N, k+1, 2) array of (lon, lat) vertices
+    (closed), from equal-length lat/lon/radius arrays. Same spherical scale as _rds_ring_lonlat_points.
+    """
+    lat = np.asarray(lat_deg, dtype=float)[:, None]
+    lon = np.asarray(lon_deg, dtype=float)[:, None]
+    rad = np.asarray(radius_m, dtype=float)[:, None]
+    ang = np.linspace(0.0, 2.0 * np.pi, k + 1)  # last angle == first: closed ring
+    dlat = rad * np.sin(ang) / _M_PER_DEG_LAT
+    dlon = rad * np.cos(ang) / (_M_PER_DEG_LAT * np.maximum(0.1, np.cos(np.deg2rad(lat))))
+    return np.stack([lon + dlon, lat + dlat], axis=-1)
 # --- RDS: end PROJ datadir helper ---
 
+def _geom_xy(df, key):
+    """
+    Column-wise (x, y) float Series from the geometry dicts of a gis_map_inputs_df slice,
+    reading geometry[key] as an [lon, lat] pair ("coordinates" for Points, "center" for Circles).
+    Missing/invalid pairs come back as NaN.
+    """
+    pairs = [g.get(key) if isinstance(g, dict) else None for g in df.get("geometry", [])]
+    pairs = [p if isinstance(p, (list, tuple)) and len(p) == 2 else (None, None) for p in pairs]
+    xy = pd.DataFrame(pairs, index=df.index, columns=["x", "y"], dtype=object)
+    return pd.to_numeric(xy["x"], errors="coerce"), pd.to_numeric(xy["y"], errors="coerce")
+
+# FastMarkerCluster callback for generate_gis_map() stations: row = [lat, lon, popup, kind]; the
+# AwesomeMarkers options per kind mirror folium.Icon(**ICON_SPECS[kind]).
+_STATION_CLUSTER_CALLBACK = """(function () {
+    var iconOpts = %s;
+    var icons = {};
+    return function (row) {
+        if (!icons[row[3]]) { icons[row[3]] = L.AwesomeMarkers.icon(iconOpts[row[3]]); }
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icons[row[3]]});
+        marker.bindPopup(row[2]);
+        return marker;
+    };
+})()"""
+
+# Client-side marker builder for _point_cluster(); row = [lat, lon, tooltip, popup_html, icon_key, color]
+_POINT_CLUSTER_CALLBACK = """(function () {
+    var iconUrls = %s;
+    var icons = {};
+    return function (row) {
+        var marker;
+        var url = iconUrls[row[4]];
+        if (url) {
+            if (!icons[row[4]]) { icons[row[4]] = L.icon({iconUrl: url, iconSize: [28, 28]}); }
+            marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icons[row[4]]});
+        } else {
+            marker = L.circleMarker(new L.LatLng(row[0], row[1]),
+                {radius: 6, weight: 1, fill: true, fillOpacity: 0.9, color: row[5]});
+        }
+        if (row[2]) { marker.bindTooltip(row[2]); }
+        if (row[3]) { marker.bindPopup(row[3]); }
+        return marker;
+    };
+})()"""
+
+def _point_cluster(rows, name, out_path, color_for_key=lambda _k: "#0b84f3"):
+    """
+    One FastMarkerCluster for a gis_map_inputs_df point layer (weather/station).
+    Markers are built in the browser from a single JSON array; each icon image is resolved
+    (and base64-encoded, in ICON_MODE=base64) once per icon_key instead of once per marker.
+    Rows without an icon fall back to a circle marker, as before.
+    """
+
+    data, icon_urls = [], {}
+    for row in rows.to_dict("records"):
+        g = row.get("geometry", {})
+        coords = g.get("coordinates", [None, None]) if isinstance(g, dict) else [None, None]
+        lat, lon = coords[1], coords[0]
+        if not (_has_value(lat) and _has_value(lon)):
+            continue
+        icon_key = row.get("icon_key")
+        icon_key = icon_key if isinstance(icon_key, str) else ""
+        if icon_key and icon_key not in icon_urls:
+            icon_urls[icon_key] = _icon_relpath_for_key(icon_key, out_path)
+            logging.info(f"[icons] Using icon_path={icon_urls[icon_key]} (icon_key={icon_key})")
+        popup = row.get("popup_html")
+        data.append([_q(lat), _q(lon), str(row.get("label", "")),
+                     popup if isinstance(popup, str) else "", icon_key, color_for_key(icon_key)])
+
+    callback = _POINT_CLUSTER_CALLBACK % json.dumps({k: v for k, v in icon_urls.items() if v})
+    return FastMarkerCluster(data, callback=callback, name=name, show=True)
+
+# Point layers of gis_map_inputs_df drawn through _point_cluster: (layer, display name, fallback
+# circle colour by icon_key for rows without an icon)
+_POINT_LAYER_SPECS = (
+    ("weather", "Weather", lambda k: "#22aa22" if k == "wx_spot" else "#0b84f3"),
+    ("station", "Stations", lambda _k: "#0b84f3"),
+)
+
+def _geojson_layer(features, default_style=None, marker=None, **tooltip_options):
+    """
+    One folium.GeoJson (a single Leaflet layer) for many features instead of one folium object
+    per row. Feature properties carry "label" (tooltip), "popup_html" ("" for none) and an
+    optional "style" dict merged over default_style (vector features). Point features use
+    marker as the template; tooltip_options go to GeoJsonTooltip (e.g. permanent=True).
+    """
+    has_popup = any(f["properties"]["popup_html"] for f in features)
+    style_function = None
+    if default_style is not None:
+        style_function = lambda f: {**default_style, **(f["properties"].get("style") or {})}
+    return folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        style_function=style_function,
+        marker=marker,
+        tooltip=folium.GeoJsonTooltip(fields=["label"], labels=False, **tooltip_options),
+        popup=folium.GeoJsonPopup(fields=["popup_html"], labels=False) if has_popup else None,
+    )
+
+def _gis_df_map_cache_key(gis_map_inputs_df, alert_row, tiles_mode) -> str:
+    """
+    Content hash (blake2b) of everything generate_gis_map_html_from_dfs() renders: the inputs rows,
+    the alert-row centre fields, the tile/icon modes and MAP_RENDER_VERSION. Same inputs → same key → same HTML.
+    """
+    meta = {k: (alert_row or {}).get(k) for k in
+            ("site_id", "position_lat_dd_a", "position_lon_dd_a", "alert_lat_dd", "alert_lon_dd")}
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([MAP_RENDER_VERSION, meta, tiles_mode, ICON_MODE], sort_keys=True, default=str).encode("utf-8"))
+    h.update(gis_map_inputs_df.to_json(orient="records", default_handler=str).encode("utf-8"))
+    return h.hexdigest()
+
+# In-process LRU of rendered DF-map HTML (key -> str), bounded to MAP_HTML_LRU_SIZE. Sits in front
+# of the on-disk dfs_<key>.html cache so repeat renders in one worker skip both Jinja and disk reads.
+_DF_MAP_HTML = OrderedDict()
+_DF_MAP_HTML_LOCK = threading.Lock()
+
+def _df_map_html_get(key):
+    with _DF_MAP_HTML_LOCK:
+        html = _DF_MAP_HTML.get(key)
+        if html is not None:
+            _DF_MAP_HTML.move_to_end(key)
+        return html
+
+def _df_map_html_put(key, html):
+    if MAP_HTML_LRU_SIZE <= 0:
+        return
+    with _DF_MAP_HTML_LOCK:
+        _DF_MAP_HTML[key] = html
+        _DF_MAP_HTML.move_to_end(key)
+        while len(_DF_MAP_HTML) > MAP_HTML_LRU_SIZE:
+            _DF_MAP_HTML.popitem(last=False)
+
 # [RDS-ANCHOR: GIS_EXPORTS]
 def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles_mode="online"):
     import folium, os, pandas as pd, logging
-    from folium import LayerControl, DivIcon, FeatureGroup, PolyLine, Marker, Circle
+    from folium import LayerControl, DivIcon, FeatureGroup, Marker, Circle
 
     # --- Center/Meta ---
-    site_id = str((alert_row or {}).get("site_id", "unknown"))
-    lat0 = (alert_row or {}).get("position_lat_dd_a") or (alert_row or {}).get("alert_lat_dd")
-    lon0 = (alert_row or {}).get("position_lon_dd_a") or (alert_row or {}).get("alert_lon_dd")
-    if pd.isna(lat0) or pd.isna(lon0):
+    # One groupby pass over the layer column; each layer below is a dict lookup (empty frame if absent)
+    # (observed=True: a categorical layer column, as the builder returns, skips unused categories)
+    layers = dict(iter(gis_map_inputs_df.groupby("layer", sort=False, observed=True)))
+    no_rows = gis_map_inputs_df.iloc[:0]
+
+    # Alert positions (A/B): coordinates, labels and popups built column-wise
+    ab_positions = layers.get("alert_position", no_rows)
+    ab_lon, ab_lat = _geom_xy(ab_positions, "coordinates")
+    ab_label = _str_col(ab_positions, "label", "")
+    ab_popup = (ab_label + " Location<br>" + ab_lat.map("{:.5f}".format) + ", " + ab_lon.map("{:.5f}".format))
+    # Valid coordinates, and only the first of any repeated (label, lat, lon) row
+    ab_ok = (ab_lat.notna() & ab_lon.notna()
+             & ~pd.DataFrame({"l": ab_label, "y": ab_lat, "x": ab_lon}).duplicated()).to_numpy()
+
+    alert_row = alert_row or {}
+    site_id = alert_row.get("site_id")
+    if site_id is None and "site_id" in gis_map_inputs_df.columns:
+        sids = gis_map_inputs_df["site_id"]
+        if sids.nunique(dropna=True) == 1:
+            site_id = sids.loc[sids.notna()].iloc[0]
+    site_id = str(site_id if site_id is not None else "unknown")
+
+    # Center: alert row A position → alert position → first valid alert_position row (A first) → safe default
+    lat0, lon0 = None, None
+    for lat_key, lon_key in (("position_lat_dd_a", "position_lon_dd_a"), ("alert_lat_dd", "alert_lon_dd")):
+        lat_v, lon_v = alert_row.get(lat_key), alert_row.get(lon_key)
+        if lat_v is not None and lon_v is not None and pd.notna(lat_v) and pd.notna(lon_v):
+            lat0, lon0 = lat_v, lon_v
+            break
+    if lat0 is None and ab_ok.any():
+        pick = np.flatnonzero(ab_ok & (ab_label.to_numpy() == "A"))  # builder labels positions by role
+        pick = pick[0] if pick.size else np.flatnonzero(ab_ok)[0]
+        lat0, lon0 = ab_lat.iloc[pick], ab_lon.iloc[pick]
+    if lat0 is None:
         lat0, lon0 = 38.255, -70.208333  # safe default
 
-    m = folium.Map(location=[float(lat0), float(lon0)], zoom_start=7, tiles="OpenStreetMap" if tiles_mode=="online" else None)
+    # --- Rendered-HTML cache (content hash of the inputs; RDS_MAP_CACHE=0 disables) ---
+    # Off with SAT_GEOJSON_EXTERNAL: the cache holds only the HTML, not its sidecar .geojson files
+    cache_key = cache_path = None
+    if MAP_CACHE_ENABLED and not SAT_GEOJSON_EXTERNAL:
+        cache_key = _gis_df_map_cache_key(gis_map_inputs_df, alert_row, tiles_mode)
+        html = _df_map_html_get(cache_key)
+        if html is not None:
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            with open(out_path, "wb") as fh:
+                fh.write(html.encode("utf-8"))
+            logging.info(f"[RDS] DF-based map memory cache hit for {site_id}")
+            return {"site_id": site_id, "map_html_path": out_path, "status": "ok"}
+        cache_path = _MAP_CACHE_DIR / f"dfs_{cache_key}.html"
+        if _map_cache_fresh(cache_path):
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            shutil.copyfile(cache_path, out_path)
+            logging.info(f"[RDS] DF-based map cache hit for {site_id}: {cache_path}")
+            return {"site_id": site_id, "map_html_path": out_path, "status": "ok"}
+
+    # prefer_canvas: rings, footprints, tracks and circle markers draw on one <canvas> instead of
+    # an SVG node each. Icon markers and their label tooltips stay DOM elements (Leaflet has no canvas path).
+    m = folium.Map(location=[float(lat0), float(lon0)], zoom_start=7, tiles="OpenStreetMap" if tiles_mode=="online" else None, prefer_canvas=True)
 
     # --- Alert Positions (A/B) ---
-    ab_positions = gis_map_inputs_df[gis_map_inputs_df["layer"] == "alert_position"]
-    for _, row in ab_positions.iterrows():
-        g = row.get("geometry", {})
-        coords = g.get("coordinates", [None, None]) if isinstance(g, dict) else [None, None]
-        lat_dd = coords[1]; lon_dd = coords[0]
-        label = row.get("label", "")
-        if lat_dd is None or lon_dd is None or pd.isna(lat_dd) or pd.isna(lon_dd):
-            continue
-        popup = f"{label} Location<br>{_fmt_num(lat_dd, 5)}, {_fmt_num(lon_dd, 5)}"
-        folium.Marker([lat_dd, lon_dd], popup=popup, icon=folium.Icon(color="red", icon="info-sign")).add_to(m)
-        folium.map.Marker([lat_dd, lon_dd], icon=DivIcon(icon_size=(150, 36), icon_anchor=(0, 0),
-                              html=f'<div style="font-size: 14pt; color: red; font-weight: bold">{label}</div>')).add_to(m)
+    # One GeoJson layer: each position is a single marker whose A/B text is a permanent tooltip,
+    # instead of an icon marker plus a separate DivIcon label marker
+    if ab_ok.any():
+        ab_features = [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [_q(lon_dd), _q(lat_dd)]},
+             "properties": {"label": label, "popup_html": popup}}
+            for lat_dd, lon_dd, label, popup in zip(ab_lat[ab_ok], ab_lon[ab_ok], ab_label[ab_ok], ab_popup[ab_ok])
+        ]
+        _geojson_layer(ab_features, marker=folium.Marker(icon=folium.Icon(**ICON_SPECS["alert"])),
+                       permanent=True, direction="right", sticky=False,
+                       class_name="rds-ab-label", style=AB_LABEL_TOOLTIP_STYLE).add_to(m)
 
     # --- Range Rings ---
-    rings = gis_map_inputs_df[gis_map_inputs_df["layer"] == "range_ring"]
-    for _, row in rings.iterrows():
-        g = row.get("geometry", {})
-        center = g.get("center") if isinstance(g, dict) else None
-        rad_m = g.get("radius_m") if isinstance(g, dict) else None
-        if (isinstance(center, (list, tuple)) and len(center) == 2
-                and center[0] is not None and center[1] is not None
-                and rad_m and rad_m > 0):
-            folium.Circle(location=[center[1], center[0]], radius=float(rad_m),
-                          color="red", fill=False, weight=2,
-                          tooltip=f"{row.get('label','')} — EE95 Ring").add_to(m)
-
-    # --- Weather Layer ---
-    wx_rows = gis_map_inputs_df[gis_map_inputs_df["layer"] == "weather"]
-    if not wx_rows.empty:
-        wx_group = folium.FeatureGroup(name="Weather", show=True)
-        from folium import Marker, Icon
-        from folium.features import CustomIcon
-        for _, row in wx_rows.iterrows():
-            g = row.get("geometry", {})
-            coords = g.get("coordinates", [None, None]) if isinstance(g, dict) else [None, None]
-            lat, lon = coords[1], coords[0]
-            if lat is None or lon is None or pd.isna(lat) or pd.isna(lon):
-                continue
-            icon_key = row.get("icon_key")
-            icon_path = _icon_relpath_for_key(icon_key, out_path) if icon_key else None
-            logging.info(f"[icons] Using icon_path={icon_path} (icon_key={icon_key})")
-            if icon_path:
-                Marker(
-                    location=[float(lat), float(lon)],
-                    tooltip=str(row.get("label","")),
-                    popup=row.get("popup_html"),
-                    icon=CustomIcon(icon_image=icon_path, icon_size=(28, 28))
-                ).add_to(wx_group)
-            else:
-                folium.CircleMarker(
-                    location=[float(lat), float(lon)],
-                    radius=6,
-                    weight=1,
-                    fill=True,
-                    fill_opacity=0.9,
-                    color="#22aa22" if (icon_key == "wx_spot") else "#0b84f3",
-                    tooltip=str(row.get("label","")),  # [updated]
-                    popup=row.get("popup_html"),       # [updated]
-                ).add_to(wx_group)
-        wx_group.add_to(m)
-
-    # --- Stations Layer ---
-    st_rows = gis_map_inputs_df[gis_map_inputs_df["layer"] == "station"]
-    if not st_rows.empty:
-        st_group = folium.FeatureGroup(name="Stations", show=True)
-        from folium import Marker, Icon
-        from folium.features import CustomIcon
-        for _, row in st_rows.iterrows():
-            g = row.get("geometry", {})
-            coords = g.get("coordinates", [None, None]) if isinstance(g, dict) else [None, None]
-            lat, lon = coords[1], coords[0]
-            if lat is None or lon is None or pd.isna(lat) or pd.isna(lon):
-                continue
-            icon_key = row.get("icon_key")
-            icon_path = _icon_relpath_for_key(icon_key, out_path) if icon_key else None
-            logging.info(f"[icons] Using icon_path={icon_path} (icon_key={icon_key})")
-            if icon_path:
-                Marker(
-                    location=[float(lat), float(lon)],
-                    tooltip=str(row.get("label","")),
-                    popup=row.get("popup_html"),
-                    icon=CustomIcon(icon_image=icon_path, icon_size=(28, 28))
-                ).add_to(st_group)
-            else:
-                folium.CircleMarker(
-                    location=[float(lat), float(lon)],
-                    radius=6,
-                    weight=1,
-                    fill=True,
-                    fill_opacity=0.9,
-                    color="#0b84f3",
-                    tooltip=str(row.get("label","")),
-                    popup=row.get("popup_html"),
-                ).add_to(st_group)
-        st_group.add_to(m)
+    rings = layers.get("range_ring", no_rows)
+    ring_lon, ring_lat = _geom_xy(rings, "center")
+    ring_rad = pd.to_numeric(pd.Series([g.get("radius_m") if isinstance(g, dict) else None
+                                        for g in rings.get("geometry", [])], index=rings.index, dtype=object),
+                             errors="coerce")
+    ring_tip = _str_col(rings, "label", "") + " — EE95 Ring"
+    ring_ok = (ring_lat.notna() & ring_lon.notna() & (ring_rad > 0)
+               & ~pd.DataFrame({"y": ring_lat, "x": ring_lon, "r": ring_rad}).duplicated()).to_numpy()
+    if ring_ok.any():
+        # All rings as polygons in one GeoJson layer (vertices computed for every ring in one numpy pass)
+        polys = np.round(_ring_polygons(ring_lat[ring_ok], ring_lon[ring_ok], ring_rad[ring_ok]), COORD_DECIMALS)
+        ring_features = [
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [poly]},
+             "properties": {"label": tip, "popup_html": ""}}
+            for poly, tip in zip(polys.tolist(), ring_tip[ring_ok])
+        ]
+        _geojson_layer(ring_features, {"color": "red", "weight": 2, "fill": False}).add_to(m)
+
+    # --- Fit view: A/B positions padded by the largest ring (floor ~5 km around a lone point) ---
+    ab_bounds = _nan_bounds(ab_lat[ab_ok], ab_lon[ab_ok])
+    if ab_bounds is not None:
+        min_lat, max_lat, min_lon, max_lon = ab_bounds
+        pad_m = max(float(ring_rad[ring_ok].max()) if ring_ok.any() else 0.0, 5_000.0)
+        dlat = pad_m / _M_PER_DEG_LAT
+        dlon = pad_m / (_M_PER_DEG_LAT * max(0.1, math.cos(math.radians((min_lat + max_lat) / 2.0))))
+        m.fit_bounds([[_q(min_lat - dlat), _q(min_lon - dlon)], [_q(max_lat + dlat), _q(max_lon + dlon)]])
+
+    # --- Weather + Stations Layers (one point-layer path, specialised by _POINT_LAYER_SPECS) ---
+    for layer_key, name, color_for_key in _POINT_LAYER_SPECS:
+        point_rows = layers.get(layer_key, no_rows)
+        if not point_rows.empty:
+            _point_cluster(point_rows, name, out_path, color_for_key=color_for_key).add_to(m)
 
     # --- Satellite Overlays (footprints, tracks, next-pass) ---
-    sat_rows = gis_map_inputs_df[gis_map_inputs_df["layer"] == "satellite_overlay"]
+    sat_rows = layers.get("satellite_overlay", no_rows)
     if not sat_rows.empty:
         fg_foot = folium.FeatureGroup(name="Satellite footprints", show=True)
         fg_track = folium.FeatureGroup(name="Satellite tracks", show=True)
@@ -679,7 +1264,8 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
         from folium import Marker, Icon
         from folium.features import CustomIcon
 
-        for _, sat in sat_rows.iterrows():
+        track_features = {}  # FeatureGroup -> track features, emitted as one GeoJson layer each
+        for sat in sat_rows.to_dict("records"):
             geom = sat.get("geometry", {})
             if not isinstance(geom, dict):
                 continue
@@ -690,9 +1276,9 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
                 center = geom.get("center")
                 rad_m  = geom.get("radius_m")
                 if (isinstance(center, (list, tuple)) and len(center) == 2
-                        and pd.notna(center[0]) and pd.notna(center[1]) and rad_m and rad_m > 0):
+                        and _has_value(center[0]) and _has_value(center[1]) and rad_m and rad_m > 0):
                     sty = (geom.get("style") or {})
-                    folium.Circle(location=[float(center[1]), float(center[0])],
+                    folium.Circle(location=[_q(center[1]), _q(center[0])],
                           radius=float(rad_m),
                           color=sty.get("color", "#0b84f3"),
                           weight=int(sty.get("weight", 1)),
@@ -709,19 +1295,19 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
                 for pt in coords:
                     try:
                         lon, lat = pt
-                        if pd.notna(lon) and pd.notna(lat):
-                            clean.append([float(lat), float(lon)])  # folium = [lat, lon]
+                        if _has_value(lon) and _has_value(lat):
+                            clean.append([_q(lat), _q(lon)])  # folium = [lat, lon]
                     except Exception:
                         continue
                 if len(clean) > 1:
-                    sty = (geom.get("style") or {})
-                    PolyLine(locations=clean,
-                     weight=int(sty.get("weight", 1)),
-                     opacity=float(sty.get("opacity", 0.6)),
-                     color=sty.get("color", "#0b84f3"),
-                     dash_array=sty.get("dashArray", "4,6"),
-                     tooltip=sat.get("label",""),
-                     popup=sat.get("popup_html")).add_to(_sat_fg_for(sat))  # [updated]
+                    popup = sat.get("popup_html")
+                    track_features.setdefault(_sat_fg_for(sat), []).append({
+                        "type": "Feature",
+                        "geometry": {"type": "LineString", "coordinates": [[lon, lat] for lat, lon in clean]},
+                        "properties": {"label": str(sat.get("label", "")),
+                                       "popup_html": popup if isinstance(popup, str) else "",
+                                       "style": geom.get("style") or {}},
+                    })
 
             # Point (next-pass)
             elif gtype == "Point":
@@ -731,17 +1317,17 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
                 # Route SAT points to orbit type group (LEO/MEO/GEO)  # [updated]
                 st = str(sat.get("sat_type") or sat.get("label") or "").lower()  # [updated]
                 target_feature_group = fg_sat_leo if "leo" in st else (fg_sat_meo if "meo" in st else fg_sat_geo)  # [updated]
-                if len(coords) == 2 and pd.notna(coords[0]) and pd.notna(coords[1]):
+                if len(coords) == 2 and _has_value(coords[0]) and _has_value(coords[1]):
                     if icon_path:
                         Marker(
-                            location=[float(coords[1]), float(coords[0])],
+                            location=[_q(coords[1]), _q(coords[0])],
                             tooltip=str(sat.get("label","Next pass")),
                             popup=sat.get("popup_html"),
                             icon=CustomIcon(icon_image=icon_path, icon_size=(28, 28))
                         ).add_to(target_feature_group)
                     else:
                         folium.CircleMarker(
-                            location=[float(coords[1]), float(coords[0])],
+                            location=[_q(coords[1]), _q(coords[0])],
                             radius=6,
                             weight=1,
                             fill=True,
@@ -751,6 +1337,20 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
                             popup=sat.get("popup_html"),
                         ).add_to(target_feature_group)
 
+        track_style = {"color": "#0b84f3", "weight": 1, "opacity": 0.6, "dashArray": "4,6"}
+        fg_kind = {fg_sat_leo: "leo", fg_sat_meo: "meo", fg_sat_geo: "geo"}
+        for fg, feats in track_features.items():
+            if SAT_GEOJSON_EXTERNAL:
+                # Sidecar file next to the HTML, fetched by the page (relative URL)
+                stem, _ = os.path.splitext(os.path.basename(out_path))
+                sidecar = f"{stem}.sat_tracks_{fg_kind[fg]}.geojson"
+                os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+                with open(os.path.join(os.path.dirname(out_path), sidecar), "w", encoding="utf-8") as fh:
+                    fh.write(_json_dumps({"type": "FeatureCollection", "features": feats}))
+                _GeoJsonUrl(sidecar, track_style).add_to(fg)
+            else:
+                _geojson_layer(feats, track_style).add_to(fg)
+
         fg_foot.add_to(m); fg_track.add_to(m); fg_next.add_to(m)
 
         from folium import LayerControl
@@ -760,7 +1360,13 @@ def generate_gis_map_html_from_dfs(gis_map_inputs_df, alert_row, out_path, tiles
     title_html = f'''<h3 align="center" style="font-size:18px"><b>RDS Alert Map: {site_id}</b></h3>'''
     m.get_root().html.add_child(folium.Element(title_html))
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    m.save(out_path)
+    html = m.get_root().render()
+    html_bytes = html.encode("utf-8")
+    with open(out_path, "wb") as fh:  # bytes, as folium's Map.save writes them
+        fh.write(html_bytes)
+    if cache_path:
+        _df_map_html_put(cache_key, html)
+        _write_map_cache(cache_path, lambda tmp: tmp.write_bytes(html_bytes))
     logging.info(f"✅ DF-based HTML map saved: {out_path}")
     return {"site_id": site_id, "map_html_path": out_path, "status": "ok"}
 
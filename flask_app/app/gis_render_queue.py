@@ -0,0 +1,65 @@
+# ============================== RDS STANDARD HEADER ==============================
+# Script Name: gis_render_queue.py
+# Last Updated (UTC): 2026-10-16
+# Update Summary:
+#   - Initial implementation: background worker pool for GIS map rendering.
+# Description:
+#   - Folium rendering (m.save) is CPU-bound and can take seconds per alert. Routes submit
+#     map jobs here and return a job_id immediately; clients poll get_map_job(job_id).
+#   - In-process worker pool (no broker required). Swap the executor for Celery/RQ later
+#     without changing the submit/status API.
+# Data Handling Notes:
+#   - Job registry is in-memory (per process) and bounded to the most recent MAX_TRACKED_JOBS.
+
+import os
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+LOG = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv("RDS_MAP_WORKERS", "2"))
+MAX_TRACKED_JOBS = 256
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="rds-map")
+_JOBS = OrderedDict()          # job_id -> Future
+_JOBS_LOCK = threading.Lock()
+
+
+def submit_map_job(render_fn, *args, **kwargs) -> str:
+    """
+    Queue render_fn(*args, **kwargs) on the map worker pool.
+    Returns a job_id for get_map_job().
+    """
+    job_id = uuid.uuid4().hex
+    future = _EXECUTOR.submit(render_fn, *args, **kwargs)
+    with _JOBS_LOCK:
+        _JOBS[job_id] = future
+        # Drop the oldest finished jobs once the registry is full
+        while len(_JOBS) > MAX_TRACKED_JOBS:
+            old_id, old_future = next(iter(_JOBS.items()))
+            if not old_future.done():
+                break
+            _JOBS.pop(old_id)
+    LOG.info(f"[maps] queued job {job_id} ({getattr(render_fn, '__name__', render_fn)})")
+    return job_id
+
+
+def get_map_job(job_id: str) -> dict:
+    """
+    Status for a queued map job:
+      {"job_id", "status": "pending|running|done|error|unknown", "result", "error"}
+    """
+    with _JOBS_LOCK:
+        future = _JOBS.get(job_id)
+    if future is None:
+        return {"job_id": job_id, "status": "unknown", "result": None, "error": None}
+    if not future.done():
+        status = "running" if future.running() else "pending"
+        return {"job_id": job_id, "status": status, "result": None, "error": None}
+    exc = future.exception()
+    if exc is not None:
+        return {"job_id": job_id, "status": "error", "result": None, "error": str(exc)}
+    return {"job_id": job_id, "status": "done", "result": future.result(), "error": None}
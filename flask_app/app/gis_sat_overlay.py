@@ -1,46 +1,110 @@
+import json
+import logging
 import pandas as pd
 
-def build_sat_overlay_geojson(sat_overlay_df: pd.DataFrame) -> dict:
-    feats = []
-    for _, r in sat_overlay_df.iterrows():
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+LOG = logging.getLogger(__name__)
+
+# Columns read per row; any that are absent are added as None so the loop indexes r[...] directly
+_SAT_OVERLAY_COLS = [
+    "sat_name", "norad_id", "at_time_utc", "alt_km", "footprint_radius_km", "tle_epoch_utc",
+    "tle_age_hours", "source", "track_window_forward_min", "track_start_utc", "track_end_utc",
+    "_variant", "distance_km", "lat_dd", "lon_dd", "track_coords", "next_pass_marker",
+]
+_SAT_TIME_COLS = ("at_time_utc", "tle_epoch_utc", "track_start_utc", "track_end_utc")
+# Rows with the same satellite, time and subpoint render identical features
+_SAT_DEDUP_COLS = ["norad_id", "at_time_utc", "lat_dd", "lon_dd"]
+
+def _time_strings(col: pd.Series) -> pd.Series:
+    """Whole-column str(): datetime64 columns as ISO-8601 UTC ("...Z", "NaT" when missing), others via str()."""
+    if pd.api.types.is_datetime64_any_dtype(col):
+        col = col.dt.tz_localize("UTC") if col.dt.tz is None else col.dt.tz_convert("UTC")
+        return col.dt.strftime("%Y-%m-%dT%H:%M:%SZ").fillna("NaT")
+    return col.astype(str)
+
+def _dumps(obj) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+def build_sat_overlay_geojson(sat_overlay_df: pd.DataFrame, out_path=None, dedup=True):
+    """
+    GeoJSON FeatureCollection of sat subpoints, forward tracks and next-pass markers.
+    With out_path, features are encoded one at a time straight into that file (the collection
+    is never held in memory) and out_path is returned instead of the dict.
+    dedup=True drops repeated (norad_id, at_time_utc, lat_dd, lon_dd) rows first.
+    """
+    if out_path is None:
+        return {"type": "FeatureCollection", "features": list(_iter_sat_features(sat_overlay_df, dedup))}
+    with open(out_path, "wb") as fh:
+        fh.write(b'{"type":"FeatureCollection","features":[')
+        for i, feat in enumerate(_iter_sat_features(sat_overlay_df, dedup)):
+            if i:
+                fh.write(b",")
+            fh.write(_dumps(feat))
+        fh.write(b"]}")
+    return out_path
+
+def _iter_sat_features(sat_overlay_df: pd.DataFrame, dedup=True):
+    missing = [c for c in _SAT_OVERLAY_COLS if c not in sat_overlay_df.columns]
+    df = sat_overlay_df.assign(**{c: None for c in missing})
+    df = df.assign(**{c: _time_strings(df[c]) for c in _SAT_TIME_COLS})
+    if dedup:
+        before = len(df)
+        df = df.drop_duplicates(subset=_SAT_DEDUP_COLS, keep="first")
+        if len(df) < before:
+            LOG.debug(f"[SAT] overlay rows deduped {before} -> {len(df)}")
+    # Footprint radius in metres for every row at once (None where the km value is missing)
+    radius_km = pd.to_numeric(df["footprint_radius_km"], errors="coerce")
+    radius_m = (radius_km * 1000.0).astype(object).where(radius_km.notna(), None).tolist()
+    # Plain dicts per row (cheaper than iterrows() Series), every expected key present
+    for r, r_radius_m in zip(df.to_dict("records"), radius_m):
         # Core point (subpoint)
-        feats.append({
+        yield ({
             "type": "Feature",
             "geometry": {"type": "Point",
                          "coordinates": [float(r["lon_dd"]), float(r["lat_dd"])]},
             "properties": {
-                "sat_name": r.get("sat_name"),
-                "norad_id": r.get("norad_id"),
-                "at_time_utc": str(r.get("at_time_utc")),
-                "alt_km": r.get("alt_km"),
-                "footprint_radius_km": r.get("footprint_radius_km"),
-                "radius_m": float(r["footprint_radius_km"]) * 1000.0 if pd.notna(r.get("footprint_radius_km")) else None,
-                "tle_epoch_utc": str(r.get("tle_epoch_utc")),
-                "tle_age_hours": r.get("tle_age_hours"),
-                "source": r.get("source"),
-                "track_window_forward_min": r.get("track_window_forward_min"),
-                "track_start_utc": str(r.get("track_start_utc")),
-                "track_end_utc": str(r.get("track_end_utc")),
-                "variant": r.get("_variant"),
-                "distance_km": r.get("distance_km"),
+                "sat_name": r["sat_name"],
+                "norad_id": r["norad_id"],
+                "at_time_utc": r["at_time_utc"],
+                "alt_km": r["alt_km"],
+                "footprint_radius_km": r["footprint_radius_km"],
+                "radius_m": r_radius_m,
+                "tle_epoch_utc": r["tle_epoch_utc"],
+                "tle_age_hours": r["tle_age_hours"],
+                "source": r["source"],
+                "track_window_forward_min": r["track_window_forward_min"],
+                "track_start_utc": r["track_start_utc"],
+                "track_end_utc": r["track_end_utc"],
+                "variant": r["_variant"],
+                "distance_km": r["distance_km"],
                 "_feature": "sat_subpoint"
             }
         })
         # Optional forward track
-        if isinstance(r.get("track_coords"), (list, tuple)) and len(r["track_coords"]) > 1:
-            feats.append({
+        if isinstance(r["track_coords"], (list, tuple)) and len(r["track_coords"]) > 1:
+            yield ({
                 "type": "Feature",
                 "geometry": {"type": "LineString",
                              "coordinates": r["track_coords"]},
                 "properties": {
-                    "sat_name": r.get("sat_name"),
+                    "sat_name": r["sat_name"],
                     "_feature": "sat_track"
                 }
             })
         # Optional next pass marker
-        npm = r.get("next_pass_marker")
-        if isinstance(npm, dict) and pd.notna(npm.get("lat_dd")) and pd.notna(npm.get("lon_dd")):
-            feats.append({
+        npm = r["next_pass_marker"]
+        npm_lat = npm.get("lat_dd") if isinstance(npm, dict) else None
+        npm_lon = npm.get("lon_dd") if isinstance(npm, dict) else None
+        # not None and not NaN (NaN != NaN): a plain compare instead of pd.notna per row
+        if npm_lat is not None and npm_lon is not None and npm_lat == npm_lat and npm_lon == npm_lon:
+            yield ({
                 "type": "Feature",
                 "geometry": {"type": "Point",
                              "coordinates": [float(npm["lon_dd"]), float(npm["lat_dd"])]},
@@ -49,5 +113,4 @@ def build_sat_overlay_geojson(sat_overlay_df: pd.DataFrame) -> dict:
                     "elevation_max_deg": npm.get("elevation_max_deg"),
                     "_feature": "next_pass"
                 }
-            })
-    return {"type": "FeatureCollection", "features": feats}
\ No newline at end of file
+            })
\ No newline at end of file
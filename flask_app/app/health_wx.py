@@ -2,6 +2,18 @@
 # Last Updated (UTC): 2025-09-11
 # Update Summary:
 # â€¢ New: one-shot health check for external weather providers.
+# â€¢ Open-Meteo and Meteostat fetches run concurrently (max of the two, not the sum).
+# â€¢ _summarize_df uses valid_utc as-is when it is already datetime64 (no re-parse).
+# â€¢ min/max span computed with one numpy reduction over the datetime64 values.
+# â€¢ Missing-column check is one set difference against df.columns.
+# â€¢ Provider responses optionally cached in SQLite per (lat, lon, hour) so back-to-back runs skip the network.
+# â€¢ Response cache is opt-in (RDS_WX_CACHE=1), lives under RDS_DATA_FOLDER and stores parquet/JSON (no pickle).
+# â€¢ String valid_utc parsed with format="ISO8601" (vectorized parser, no dateutil fallback).
+# â€¢ Absent or all-null valid_utc returns an empty span without touching the timestamps.
+# â€¢ Window end floored to the hour in one call; common window lengths use prebuilt Timedeltas.
+# â€¢ Failure/skip paths reuse one read-only empty DataFrame and a shared empty-summary template.
+# â€¢ Summary adds min_ts_ns/max_ts_ns (UTC epoch ns, JSON-ready) next to the min_ts/max_ts Timestamps;
+#   the span comes from one int64 reduction and the log lines are formatted from the ns values.
 # â€¢ Prints row counts, time span, missing columns, and sample rows.
 #
 # Description:
@@ -20,9 +32,18 @@
 #
 # Data Handling Notes:
 # â€¢ Uses UTC-normalized windows via utils_time.now_utc().
+# â€¢ With RDS_WX_CACHE=1, non-empty provider frames are cached in RDS_WX_CACHE_PATH (SQLite, default
+#   <RDS_DATA_FOLDER>/cache/rds_wx.sqlite) for RDS_WX_CACHE_TTL_S seconds, keyed by provider, fetch params,
+#   lat/lon and the hour bucket of end_utc. Frames are stored as parquet when pyarrow is installed, else JSON.
 
 from app.setup_imports import *  # pandas as pd, numpy as np, logging, etc.
 
+import io
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from app.utils_time import now_utc
 from app.wx_fetch_open_meteo import fetch_open_meteo_obs
 
@@ -33,52 +54,184 @@ try:
 except Exception:
     HAS_METEOSTAT = False
 
+try:
+    import pyarrow  # noqa: F401  (parquet engine for the response cache)
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
 LOG = logging.getLogger("health_wx")
 logging.basicConfig(level=os.environ.get("RDS_LOG_LEVEL", "INFO"))
 
-REQUIRED_COLS = ["valid_utc", "lat", "lon", "provider", "source_type"]
+REQUIRED_COLS = ("valid_utc", "lat", "lon", "provider", "source_type")
+REQUIRED_COLS_SET = frozenset(REQUIRED_COLS)
+
+# Failure/skip paths: one shared empty frame (treat as read-only) + the empty summary shape
+_EMPTY_DF = pd.DataFrame()
+_EMPTY_SUM = {"rows": 0, "min_ts": None, "max_ts": None, "min_ts_ns": None, "max_ts_ns": None,
+              "missing_cols": list(REQUIRED_COLS)}
+
+
+def _empty_summary() -> dict:
+    return {**_EMPTY_SUM, "missing_cols": list(REQUIRED_COLS)}  # fresh list: callers may mutate
+
+# Prebuilt window lengths for the usual health-check spans (hours -> Timedelta)
+_HOUR_TD = {h: pd.Timedelta(hours=h) for h in (1, 3, 6, 12, 24)}
+
+# Provider response cache (CI runs the health check back-to-back within the same hour)
+WX_CACHE_ENABLED = os.environ.get("RDS_WX_CACHE", "0") == "1"
+WX_CACHE_PATH = os.environ.get("RDS_WX_CACHE_PATH", os.path.join(
+    os.getenv("RDS_DATA_FOLDER", "C:/Users/gehig/Projects/RescueDecisionSystems/data"), "cache", "rds_wx.sqlite"))
+WX_CACHE_TTL_S = int(os.environ.get("RDS_WX_CACHE_TTL_S", "3600"))
+_WX_CACHE = None                   # sqlite3.Connection, opened on first use
+_WX_CACHE_LOCK = threading.Lock()  # fetches run on worker threads; one connection, serialized
+
+
+def _wx_cache() -> sqlite3.Connection:
+    global _WX_CACHE
+    if _WX_CACHE is None:
+        os.makedirs(os.path.dirname(WX_CACHE_PATH) or ".", exist_ok=True)
+        con = sqlite3.connect(WX_CACHE_PATH, check_same_thread=False)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS wx_frames ("
+            " provider TEXT, params TEXT, lat REAL, lon REAL, hour_bucket INTEGER,"
+            " fmt TEXT, payload BLOB, fetched_at INTEGER,"
+            " PRIMARY KEY (provider, params, lat, lon, hour_bucket))"
+        )
+        _WX_CACHE = con
+    return _WX_CACHE
+
+
+def _frame_to_payload(df: pd.DataFrame):
+    """(fmt, bytes) for the cache: parquet when pyarrow is available, else pandas table-schema JSON."""
+    if HAS_PYARROW:
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        return "parquet", buf.getvalue()
+    return "json", df.to_json(orient="table", index=False, date_unit="ns").encode("utf-8")
+
+
+def _payload_to_frame(fmt: str, payload: bytes) -> pd.DataFrame:
+    if fmt == "parquet":
+        return pd.read_parquet(io.BytesIO(payload))
+    if fmt == "json":
+        return pd.read_json(io.StringIO(payload.decode("utf-8")), orient="table")
+    raise ValueError(f"unknown cache payload format {fmt!r}")
+
+
+def _cached_fetch(provider: str, params: str, lat: float, lon: float, hour_bucket: int,
+                  fetch_fn, *args, **kwargs) -> pd.DataFrame:
+    """fetch_fn(*args, **kwargs) behind the opt-in SQLite response cache; empty/failed fetches are not stored."""
+    if not (WX_CACHE_ENABLED and WX_CACHE_PATH):
+        return fetch_fn(*args, **kwargs)
+    key = (provider, params, float(lat), float(lon), int(hour_bucket))
+    try:
+        with _WX_CACHE_LOCK:
+            row = _wx_cache().execute(
+                "SELECT fmt, payload, fetched_at FROM wx_frames"
+                " WHERE provider=? AND params=? AND lat=? AND lon=? AND hour_bucket=?", key).fetchone()
+        if row is not None and time.time() - row[2] <= WX_CACHE_TTL_S:
+            LOG.info("%s: cache hit (hour_bucket=%s)", provider, hour_bucket)
+            return _payload_to_frame(row[0], row[1])
+    except Exception as e:
+        LOG.warning("WX cache read failed (%s); fetching live.", e)
+
+    df = fetch_fn(*args, **kwargs)
+    if df is not None and not df.empty:
+        try:
+            fmt, payload = _frame_to_payload(df)
+            with _WX_CACHE_LOCK:
+                con = _wx_cache()
+                con.execute("INSERT OR REPLACE INTO wx_frames VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            key + (fmt, payload, int(time.time())))
+                con.commit()
+        except Exception as e:
+            LOG.warning("WX cache write failed: %s", e)
+    return df
+
+
+def _ts_span_ns(ts: pd.Series):
+    """(min, max) epoch nanoseconds (UTC) of a datetime64 Series via numpy (skips NaT); (None, None) when nothing is valid."""
+    vals = ts.values  # tz-aware columns come back as UTC datetime64
+    vals = vals[~np.isnat(vals)].astype("datetime64[ns]").view("i8")
+    if vals.size == 0:
+        return None, None
+    return int(vals.min()), int(vals.max())
+
+
+def _ns_to_ts(epoch_ns, tz):
+    """Timestamp for an epoch-ns span value, in the source column's tz (naive when the column was naive)."""
+    ts = pd.Timestamp(epoch_ns)
+    return ts.tz_localize("UTC").tz_convert(tz) if tz is not None else ts
+
+
+def _fmt_ts(epoch_ns):
+    """ISO-8601 UTC string for a summary timestamp (epoch ns), or None."""
+    return pd.Timestamp(epoch_ns, tz="UTC").isoformat() if epoch_ns is not None else None
 
 
 def _summarize_df(df: pd.DataFrame) -> dict:
     if df is None or df.empty:
-        return {"rows": 0, "min_ts": None, "max_ts": None, "missing_cols": REQUIRED_COLS}
-    missing = [c for c in REQUIRED_COLS if c not in df.columns]
-    ts = pd.to_datetime(df["valid_utc"], errors="coerce") if "valid_utc" in df.columns else pd.Series([], dtype="datetime64[ns, UTC]")
-    if not isinstance(ts, pd.Series) or ts.empty:
-        min_ts = max_ts = None
+        return _empty_summary()
+    absent = REQUIRED_COLS_SET.difference(df.columns)
+    missing = [c for c in REQUIRED_COLS if c in absent]  # keep declared order for the logs
+    # Provider-failure path: nothing to span, skip dtype checks/parsing entirely
+    if "valid_utc" in absent or df["valid_utc"].isna().all():
+        return {**_EMPTY_SUM, "rows": int(df.shape[0]), "missing_cols": missing}
+    if pd.api.types.is_datetime64_any_dtype(df["valid_utc"]):
+        ts = df["valid_utc"]  # fetchers already normalize to UTC datetimes
     else:
-        min_ts = ts.min()
-        max_ts = ts.max()
-    return {"rows": int(df.shape[0]), "min_ts": min_ts, "max_ts": max_ts, "missing_cols": missing}
+        ts = pd.to_datetime(df["valid_utc"], errors="coerce", utc=True, format="ISO8601", cache=True)
+    min_ns, max_ns = _ts_span_ns(ts)
+    if min_ns is None:
+        return {**_EMPTY_SUM, "rows": int(df.shape[0]), "missing_cols": missing}
+    tz = getattr(ts.dtype, "tz", None)
+    return {"rows": int(df.shape[0]), "min_ts": _ns_to_ts(min_ns, tz), "max_ts": _ns_to_ts(max_ns, tz),
+            "min_ts_ns": min_ns, "max_ts_ns": max_ns, "missing_cols": missing}
 
 
 def run_wx_health_check(lat: float, lon: float, hours: int = 6,
                         radius_km: float = 75.0, max_stations: int = 5,
                         include_marine: bool = True) -> dict:
-    """Return a dict with per-provider row counts, timespan, and missing cols."""
-    end_utc = now_utc().replace(minute=0, second=0, microsecond=0)
-    start_utc = end_utc - pd.Timedelta(hours=hours)
+    """Return a dict with per-provider row counts, timespan (Timestamps + UTC epoch ns), and missing cols."""
+    end_utc = now_utc().floor("h")
+    start_utc = end_utc - (_HOUR_TD.get(hours) or pd.Timedelta(hours=hours))
 
     LOG.info("WX Health window: %s â†’ %s @ (%.4f, %.4f)", start_utc, end_utc, lat, lon)
 
+    hour_bucket = int(end_utc.timestamp() // 3600)
+
+    # Both providers are independent network calls: issue them together
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="rds-wx-health") as pool:
+        om_fut = pool.submit(_cached_fetch, "open_meteo", f"hours={hours};marine={int(include_marine)}",
+                             lat, lon, hour_bucket,
+                             fetch_open_meteo_obs, lat, lon, start_utc, end_utc,
+                             include_marine=include_marine)
+        ms_fut = (pool.submit(_cached_fetch, "meteostat",
+                              f"hours={hours};radius_km={radius_km};max_stations={max_stations}",
+                              lat, lon, hour_bucket,
+                              fetch_meteostat_obs_near, lat, lon, start_utc, end_utc,
+                              radius_km=radius_km, max_stations=max_stations)
+                  if HAS_METEOSTAT else None)
+
     # Open-Meteo
     try:
-        om = fetch_open_meteo_obs(lat, lon, start_utc, end_utc, include_marine=include_marine)
+        om = om_fut.result()
         om_sum = _summarize_df(om)
     except Exception as e:
         LOG.exception("Open-Meteo fetch failed: %s", e)
-        om, om_sum = pd.DataFrame(), {"rows": 0, "min_ts": None, "max_ts": None, "missing_cols": REQUIRED_COLS}
+        om, om_sum = _EMPTY_DF, _empty_summary()
 
     # Meteostat
     try:
-        if HAS_METEOSTAT:
-            ms = fetch_meteostat_obs_near(lat, lon, start_utc, end_utc, radius_km=radius_km, max_stations=max_stations)
+        if ms_fut is not None:
+            ms = ms_fut.result()
             ms_sum = _summarize_df(ms)
         else:
-            ms, ms_sum = pd.DataFrame(), {"rows": 0, "min_ts": None, "max_ts": None, "missing_cols": REQUIRED_COLS}
+            ms, ms_sum = _EMPTY_DF, _empty_summary()
     except Exception as e:
         LOG.exception("Meteostat fetch failed: %s", e)
-        ms, ms_sum = pd.DataFrame(), {"rows": 0, "min_ts": None, "max_ts": None, "missing_cols": REQUIRED_COLS}
+        ms, ms_sum = _EMPTY_DF, _empty_summary()
 
     out = {
         "params": {"lat": lat, "lon": lon, "hours": hours, "radius_km": radius_km, "max_stations": max_stations},
@@ -89,9 +242,9 @@ def run_wx_health_check(lat: float, lon: float, hours: int = 6,
 
     # Log concise summary for pipeline logs
     LOG.info("Open-Meteo: rows=%s span=[%s, %s] missing=%s",
-             om_sum["rows"], om_sum["min_ts"], om_sum["max_ts"], om_sum["missing_cols"])
+             om_sum["rows"], _fmt_ts(om_sum["min_ts_ns"]), _fmt_ts(om_sum["max_ts_ns"]), om_sum["missing_cols"])
     LOG.info("Meteostat:  rows=%s span=[%s, %s] missing=%s",
-             ms_sum["rows"], ms_sum["min_ts"], ms_sum["max_ts"], ms_sum["missing_cols"])
+             ms_sum["rows"], _fmt_ts(ms_sum["min_ts_ns"]), _fmt_ts(ms_sum["max_ts_ns"]), ms_sum["missing_cols"])
 
     return out
 
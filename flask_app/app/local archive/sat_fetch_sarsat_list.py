@@ -3,6 +3,12 @@
 # Last Updated (UTC): 2025-09-22
 # Update Summary:
 # - Initial version: builds SARSAT-capable satellite list from CelesTrak
+# - CelesTrak groups are fetched concurrently over one pooled requests.Session
+# - Retries/backoff handled by urllib3 Retry on the session adapter (no manual sleep loop)
+# - Responses are streamed via iter_lines straight into parse_tle_lines
+# - build_sat_list builds columns directly (norad_id Int64, is_active int8)
+# - classify_sat uses a group-key lookup; group names match exactly (no 'bei'/'glo' substrings)
+# - Conditional GET (ETag/If-Modified-Since) against a per-group on-disk TLE cache; 304 reuses it
 # Description:
 # - Fetches TLE groups from CelesTrak (LEO/GEO/MEO sats with SARSAT payloads)
 # - Produces DataFrame and saves to /data/reference/sarsat_sat_list.csv
@@ -15,14 +21,28 @@
 #   tle_source, nominal_alt_km, is_active, fetched_utc]
 # Data Handling Notes:
 # - If fetch/parsing fails, logs warning and reuses last known CSV.
+# - Raw TLE text cached at <RDS_DATA_FOLDER>/cache/tle_<group>.txt (+ .meta.json); RDS_TLE_CACHE=0 disables.
 # - Safe-fail: pipeline continues without fresh updates.
+# - A snappy Parquet copy (<sat_list>.parquet) is written beside the CSV when a parquet engine is
+#   installed (RDS_SAT_LIST_FORMAT=csv turns it off); load_sat_list() prefers it and falls back to CSV.
 # ======================================================================
 
 from app.setup_imports import *
+import json
 import os
 import requests
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow  # noqa: F401  (parquet engine for the sat_list sidecar)
+    HAS_PARQUET = True
+except Exception:
+    HAS_PARQUET = False
 
 # -------------------------------
 # Config
@@ -34,6 +54,9 @@ log = globals().get("log") or logging.getLogger("sat_fetch")
 if not log.handlers:
     logging.basicConfig(level=os.getenv("RDS_LOG_LEVEL", "INFO"))
 
+# "both" (default): CSV + Parquet sidecar when available; "csv": CSV only
+SAT_LIST_FORMAT = os.getenv("RDS_SAT_LIST_FORMAT", "both").strip().lower()
+
 
 CELESTRAK_GROUPS = {
     "sarsat":  "https://celestrak.org/NORAD/elements/gp.php?GROUP=SARSAT&FORMAT=TLE",
@@ -62,6 +85,25 @@ NOMINAL_ALT = {
     "MEOSAR": 20200.0,
 }
 
+# Raw TLE responses are kept on disk so unchanged groups can be revalidated with a 304
+TLE_CACHE_ENABLED = os.getenv("RDS_TLE_CACHE", "1") == "1"
+_TLE_CACHE_DIR = Path(os.getenv("RDS_TLE_CACHE_DIR", Path(os.getenv("RDS_DATA_FOLDER", "data")) / "cache"))
+
+# Group key (CELESTRAK_GROUPS) -> (type, constellation)
+_GROUP_CLASSIFY = {
+    "noaa":    ("LEOSAR", "NOAA/MetOp"),
+    "sarsat":  ("LEOSAR", "NOAA/MetOp"),
+    "goes":    ("GEOSAR", "GEO"),
+    "gps":     ("MEOSAR", "GPS"),
+    "galileo": ("MEOSAR", "Galileo"),
+    "glonass": ("MEOSAR", "GLONASS"),
+    "beidou":  ("MEOSAR", "BeiDou"),
+}
+_GEO_NAME_TOKENS = ("msg", "elektro", "insat")
+
+_NORAD_RE = re.compile(r"\((\d+)\)")
+_TLE_DATA_PREFIXES = ("1 ", "2 ")
+
 # -------------------------------
 # Helpers
 # -------------------------------
@@ -70,33 +112,93 @@ def parse_tle_lines(lines, group):
     """Extract sat names and optional NORAD IDs from TLE headers."""
     sats = []
     for line in lines:
-        if line.strip() and not line.startswith("1 ") and not line.startswith("2 "):
-            name = line.strip()
-            m = re.search(r"\((\d+)\)", name)
-            norad_id = int(m.group(1)) if m else None
-            sats.append((name, norad_id, group))
+        if not line.strip() or line[:2] in _TLE_DATA_PREFIXES:
+            continue
+        name = line.strip()
+        m = _NORAD_RE.search(name)
+        norad_id = int(m.group(1)) if m else None
+        sats.append((name, norad_id, group))
     return sats
 
-import time
 UA = {"User-Agent": "RDS-SARSAT-Fetch/1.0 (+https://local)"}
 
+# One pooled session shared by the group fetch threads (keep-alive to celestrak.org);
+# transient 5xx/connection errors are retried with backoff by urllib3.
+_RETRY = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+_SESSION = requests.Session()
+_SESSION.headers.update(UA)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=_RETRY))
+
+def _tle_cache_paths(group):
+    return _TLE_CACHE_DIR / f"tle_{group}.txt", _TLE_CACHE_DIR / f"tle_{group}.meta.json"
+
+def _load_tle_meta(group):
+    txt_path, meta_path = _tle_cache_paths(group)
+    if not (TLE_CACHE_ENABLED and txt_path.exists() and meta_path.exists()):
+        return {}
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def _cache_tle_lines(lines, url, group, headers):
+    """Yield lines unchanged while writing them to the group's cache; meta is saved once the body completes."""
+    txt_path, meta_path = _tle_cache_paths(group)
+    tmp_path = txt_path.with_suffix(".tmp")
+    try:
+        _TLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        f = open(tmp_path, "w", encoding="utf-8")
+    except OSError as e:
+        log.warning(f"[sat_fetch] {group} TLE cache not writable: {e}")
+        yield from lines
+        return
+    with f:
+        for line in lines:
+            f.write(line + "\n")
+            yield line
+    try:
+        os.replace(tmp_path, txt_path)
+        with open(meta_path, "w", encoding="utf-8") as mf:
+            json.dump({"url": url, "etag": headers.get("ETag"),
+                       "last_modified": headers.get("Last-Modified")}, mf)
+    except OSError as e:
+        log.warning(f"[sat_fetch] {group} TLE cache save failed: {e}")
+
 def _try_one(url, group):
-    r = requests.get(url, headers=UA, timeout=20)
-    if r.status_code == 200:
-        return parse_tle_lines(r.text.splitlines(), group)
-    log.warning(f"[sat_fetch] {group} fetch {url} -> HTTP {r.status_code}")
-    return []
+    # Revalidate against the cached copy for this exact URL (alternates have their own validators)
+    meta = _load_tle_meta(group)
+    cond = {}
+    if meta.get("url") == url:
+        if meta.get("etag"):
+            cond["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cond["If-Modified-Since"] = meta["last_modified"]
+
+    # Stream the body line by line into the parser (no full-text copy)
+    with _SESSION.get(url, timeout=20, stream=True, headers=cond) as r:
+        if r.status_code == 304 and cond:
+            log.info(f"[sat_fetch] {group} not modified; using cached TLEs")
+            with open(_tle_cache_paths(group)[0], encoding="utf-8") as f:
+                return parse_tle_lines(f, group)
+        if r.status_code == 200:
+            if r.encoding is None:
+                r.encoding = "utf-8"  # iter_lines only decodes when an encoding is known
+            lines = r.iter_lines(decode_unicode=True)
+            if TLE_CACHE_ENABLED:
+                lines = _cache_tle_lines(lines, url, group, r.headers)
+            return parse_tle_lines(lines, group)
+        log.warning(f"[sat_fetch] {group} fetch {url} -> HTTP {r.status_code}")
+        return []
 
 def safe_fetch(url, group):
-    # primary with retries
-    for i in range(3):
-        try:
-            sats = _try_one(url, group)
-            if sats: 
-                return sats
-        except Exception as e:
-            log.warning(f"[sat_fetch] {group} try {i+1} error: {e}")
-        time.sleep(1 + i)  # jittered backoff
+    # primary (session adapter retries transient failures with backoff)
+    try:
+        sats = _try_one(url, group)
+        if sats:
+            return sats
+    except Exception as e:
+        log.warning(f"[sat_fetch] {group} primary error: {e}")
 
     # alternates
     for alt in ALT_ENDPOINTS.get(group, []):
@@ -106,26 +208,24 @@ def safe_fetch(url, group):
                 return sats
         except Exception as e:
             log.warning(f"[sat_fetch] {group} alt error: {e}")
-        time.sleep(1)
 
     return []
 
 def classify_sat(name, group):
     """Classify as LEOSAR / GEOSAR / MEOSAR and tag constellation."""
-    g = group.lower()
+    res = _GROUP_CLASSIFY.get(group.lower())
+    if res is not None and res[0] == "LEOSAR":
+        return res
+    # Name overrides only matter outside the LEOSAR groups (same precedence as before)
     n = name.lower()
-    if "noaa" in g or "sarsat" in g or "metop" in n:
+    if "metop" in n:
         return "LEOSAR", "NOAA/MetOp"
-    if "goes" in g or "msg" in n or "elektro" in n or "insat" in n:
+    if res is not None and res[0] == "GEOSAR":
+        return res
+    if any(tok in n for tok in _GEO_NAME_TOKENS):
         return "GEOSAR", "GEO"
-    if "gps" in g:
-        return "MEOSAR", "GPS"
-    if "galileo" in g:
-        return "MEOSAR", "Galileo"
-    if "glo" in g:
-        return "MEOSAR", "GLONASS"
-    if "bei" in g:
-        return "MEOSAR", "BeiDou"
+    if res is not None:
+        return res
     return "UNKNOWN", group
 
 # -------------------------------
@@ -134,25 +234,43 @@ def classify_sat(name, group):
 
 def build_sat_list():
     """Build DataFrame of SARSAT satellites from external sources."""
-    all_rows = []
-    for group, url in CELESTRAK_GROUPS.items():
-        sats = safe_fetch(url, group)
-        for (name, norad_id, grp) in sats:
+    # Groups are independent and network-bound: fetch them all at once
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=len(CELESTRAK_GROUPS)) as ex:
+        futures = {ex.submit(safe_fetch, url, group): group for group, url in CELESTRAK_GROUPS.items()}
+        for fut in as_completed(futures):
+            group = futures[fut]
+            try:
+                fetched[group] = fut.result()
+            except Exception as e:
+                log.warning(f"[sat_fetch] {group} fetch failed: {e}")
+                fetched[group] = []
+
+    # Columnar build: one list per output column, DataFrame constructed once
+    types, constellations, names, norad_ids, sources, alts = [], [], [], [], [], []
+    fetched_utc = datetime.now(timezone.utc).isoformat()  # one tz-aware timestamp per batch
+    for group in CELESTRAK_GROUPS:  # keep the configured group order in the output
+        for (name, norad_id, grp) in fetched[group]:
             sat_type, constellation = classify_sat(name, grp)
-            row = {
-                "type": sat_type,
-                "constellation": constellation,
-                "designator": None,  # left for RCC code mapping later
-                "common_name": name,
-                "norad_id": norad_id,
-                "tle_source": grp,
-                "nominal_alt_km": NOMINAL_ALT.get(sat_type, None),
-                "is_active": 1,
-                "fetched_utc": datetime.utcnow().isoformat(),
-            }
-            all_rows.append(row)
-
-    return pd.DataFrame(all_rows)
+            types.append(sat_type)
+            constellations.append(constellation)
+            names.append(name)
+            norad_ids.append(norad_id)
+            sources.append(grp)
+            alts.append(NOMINAL_ALT.get(sat_type, None))
+
+    n = len(names)
+    return pd.DataFrame({
+        "type": types,
+        "constellation": constellations,
+        "designator": [None] * n,  # left for RCC code mapping later
+        "common_name": names,
+        "norad_id": pd.array(norad_ids, dtype="Int64"),
+        "tle_source": sources,
+        "nominal_alt_km": np.array(alts, dtype="float64"),
+        "is_active": np.ones(n, dtype="int8"),
+        "fetched_utc": [fetched_utc] * n,
+    })
 
 def save_sat_list(df):
     """Save DataFrame to CSV, safe-fail with last known good fallback."""
@@ -167,6 +285,31 @@ def save_sat_list(df):
         log.info(f"[sat_fetch] Saved updated sat_list to {out_path}")
     except Exception as e:
         log.warning(f"[sat_fetch] Save failed: {e}")
+        return
+
+    if SAT_LIST_FORMAT != "csv" and HAS_PARQUET:
+        pq_path = _parquet_path(out_path)
+        try:
+            df.astype({"norad_id": "Int64"}).to_parquet(pq_path, compression="snappy", index=False)
+            log.info(f"[sat_fetch] Saved Parquet sat_list to {pq_path}")
+        except Exception as e:
+            log.warning(f"[sat_fetch] Parquet save skipped: {e}")
+
+def _parquet_path(csv_path):
+    return str(Path(csv_path).with_suffix(".parquet"))
+
+def load_sat_list():
+    """Load the saved sat_list, preferring the Parquet copy when it is at least as new as the CSV."""
+    csv_path = get_file_path("sat_list")
+    pq_path = _parquet_path(csv_path)
+    if HAS_PARQUET and os.path.exists(pq_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(pq_path) >= os.path.getmtime(csv_path)
+    ):
+        try:
+            return pd.read_parquet(pq_path)
+        except Exception as e:
+            log.warning(f"[sat_fetch] Parquet read failed, using CSV: {e}")
+    return pd.read_csv(csv_path, dtype={"norad_id": "Int64"})
 
 def fetch_and_update_sat_list():
     """Top-level routine: fetch, build DataFrame, save if good."""
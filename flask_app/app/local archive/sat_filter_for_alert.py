@@ -4,6 +4,11 @@
 # Update Summary:
 # - New module for scoping satellites to an alert and annotating visibility.
 # - MVP annotates visibility only when sat subpoints are available (future). No elevation calc yet.
+# - annotate_visibility_distance computes A/B distances as NumPy arrays over the whole frame (no iterrows).
+# - Haversine uses 2*atan2(sqrt(a), sqrt(1-a)) for stability on near-antipodal points.
+# - Optional numba kernel (HAS_NUMBA) fuses distance + visibility in one parallel pass; NumPy fallback.
+# - _first_pair picks the first row with both A/B coordinates finite (no cross-row lat/lon mixing).
+# - Latitude-band fast reject skips the haversine for subpoints that cannot be inside the footprint.
 # Description:
 # - Purpose: Provide helpers to select reporting-only or visible-now subsets and annotate 'visible_for'.
 # - Primary Inputs:
@@ -21,9 +26,21 @@
 from app.setup_imports import *
 import pandas as pd
 import numpy as np
-from math import radians, sin, cos, asin, sqrt
+import math
+from math import radians, cos
 from typing import Optional
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+    prange = range
+
+# visible_for labels indexed by code: bit 0 = A, bit 1 = B
+_VISIBLE_LABELS = np.array([np.nan, "A", "B", "AB"], dtype=object)
+_NAN_PAIR = (float("nan"), float("nan"))
+
 
 def annotate_visibility_distance(sat_overlay_df: pd.DataFrame, alert_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -45,57 +62,95 @@ def annotate_visibility_distance(sat_overlay_df: pd.DataFrame, alert_df: pd.Data
     A = _first_pair(alert_df, "position_lat_dd_a", "position_lon_dd_a")
     B = _first_pair(alert_df, "position_lat_dd_b", "position_lon_dd_b")
 
-    def haversine_km(lat1, lon1, lat2, lon2):
-        if not all(np.isfinite([lat1, lon1, lat2, lon2])):
-            return float("nan")
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        return 6371.0 * c
-
-    visible = []
-    for _, r in sat_overlay_df.iterrows():
-        lat = r.get("lat_dd", np.nan)
-        lon = r.get("lon_dd", np.nan)
-        R = r.get("footprint_radius_km", np.nan)
-        if not np.isfinite(lat) or not np.isfinite(lon) or not np.isfinite(R):
-            visible.append(np.nan)
-            continue
-
-        vis_a = False
-        vis_b = False
-        if A:
-            da = haversine_km(lat, lon, A[0], A[1])
-            vis_a = np.isfinite(da) and da <= R
-        if B:
-            db = haversine_km(lat, lon, B[0], B[1])
-            vis_b = np.isfinite(db) and db <= R
-
-        if vis_a and vis_b:
-            visible.append("AB")
-        elif vis_a:
-            visible.append("A")
-        elif vis_b:
-            visible.append("B")
-        else:
-            visible.append(np.nan)
+    # Whole-frame arrays; non-numeric values become NaN and are never visible
+    lat = pd.to_numeric(sat_overlay_df["lat_dd"], errors="coerce").to_numpy(dtype=np.float64)
+    lon = pd.to_numeric(sat_overlay_df["lon_dd"], errors="coerce").to_numpy(dtype=np.float64)
+    R = pd.to_numeric(sat_overlay_df["footprint_radius_km"], errors="coerce").to_numpy(dtype=np.float64)
+
+    if HAS_NUMBA:
+        # Fused single-pass kernel: no dlat/dlon/a temporaries for large batches
+        (lat_a, lon_a), (lat_b, lon_b) = A or _NAN_PAIR, B or _NAN_PAIR
+        codes = np.empty(lat.shape, dtype=np.uint8)
+        _haversine_visible(lat, lon, R, lat_a, lon_a, lat_b, lon_b, codes)
+    else:
+        valid = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(R)
+        vis_a = _visible_from(lat, lon, R, A) & valid
+        vis_b = _visible_from(lat, lon, R, B) & valid
+        codes = vis_a.astype(np.uint8) | (vis_b.astype(np.uint8) << 1)
 
     sat_overlay_df = sat_overlay_df.copy()
-    sat_overlay_df["visible_for"] = visible
+    sat_overlay_df["visible_for"] = np.take(_VISIBLE_LABELS, codes)
     return sat_overlay_df
 
 
 # ----------------------- Helpers -----------------------
 
+def _haversine_km_vec(lat: np.ndarray, lon: np.ndarray, lat0: float, lon0: float) -> np.ndarray:
+    """Great-circle km from each (lat, lon) to one point; NaN in -> NaN out.
+
+    Uses the atan2 form, which stays accurate near antipodal pairs where
+    arcsin(sqrt(a)) saturates at a ~= 1.
+    """
+    lat_r = np.radians(lat)
+    lat0_r = radians(lat0)
+    dlat = np.radians(lat0 - lat)
+    dlon = np.radians(lon0 - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat_r) * cos(lat0_r) * np.sin(dlon / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+
+
+def _visible_from(lat: np.ndarray, lon: np.ndarray, R: np.ndarray, point) -> np.ndarray:
+    if not point or not (np.isfinite(point[0]) and np.isfinite(point[1])):
+        return np.zeros(lat.shape, dtype=bool)
+    # Fast reject: the latitude gap alone is a lower bound on great-circle distance,
+    # so only rows inside the footprint's latitude band need the full haversine.
+    with np.errstate(invalid="ignore"):
+        candidate = 6371.0 * np.radians(np.abs(lat - point[0])) <= R
+    out = np.zeros(lat.shape, dtype=bool)
+    if candidate.any():
+        out[candidate] = _haversine_km_vec(lat[candidate], lon[candidate], point[0], point[1]) <= R[candidate]
+    return out
+
+
+def _haversine_visible(lat, lon, R, lat_a, lon_a, lat_b, lon_b, out):
+    """Per-row visibility code (0 none, 1 A, 2 B, 3 AB); same rules as the NumPy path."""
+    for i in prange(lat.shape[0]):
+        code = 0
+        if np.isfinite(lat[i]) and np.isfinite(lon[i]) and np.isfinite(R[i]):
+            for bit, lat0, lon0 in ((1, lat_a, lon_a), (2, lat_b, lon_b)):
+                if not (np.isfinite(lat0) and np.isfinite(lon0)):
+                    continue
+                if 6371.0 * math.radians(abs(lat[i] - lat0)) > R[i]:
+                    continue  # latitude gap alone exceeds the footprint
+                dlat = math.radians(lat0 - lat[i])
+                dlon = math.radians(lon0 - lon[i])
+                a = (math.sin(dlat / 2) ** 2
+                     + math.cos(math.radians(lat[i])) * math.cos(math.radians(lat0)) * math.sin(dlon / 2) ** 2)
+                a = min(max(a, 0.0), 1.0)
+                if 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a)) <= R[i]:
+                    code |= bit
+        out[i] = code
+
+
+if HAS_NUMBA:
+    # No nnan/ninf fast-math flags: the kernel relies on isfinite() for missing subpoints
+    _haversine_visible = njit(parallel=True, cache=True,
+                              fastmath={"contract", "arcp", "afn", "reassoc"})(_haversine_visible)
+
+
 def _first_pair(df: pd.DataFrame, lat_col: str, lon_col: str) -> Optional[tuple[float,float]]:
-    if lat_col in df.columns and lon_col in df.columns:
-        lat_series = df[lat_col].dropna()
-        lon_series = df[lon_col].dropna()
-        if len(lat_series) > 0 and len(lon_series) > 0:
-            try:
-                return float(lat_series.iloc[0]), float(lon_series.iloc[0])
-            except Exception:
-                return None
-    return None
+    """First row where both lat and lon are finite (never mixes values from different rows)."""
+    if lat_col not in df.columns or lon_col not in df.columns:
+        return None
+    try:
+        arr_lat = pd.to_numeric(df[lat_col], errors="coerce").to_numpy(dtype=np.float64)
+        arr_lon = pd.to_numeric(df[lon_col], errors="coerce").to_numpy(dtype=np.float64)
+        mask = np.isfinite(arr_lat) & np.isfinite(arr_lon)
+        if not mask.any():
+            return None
+        idx = int(mask.argmax())
+        return float(arr_lat[idx]), float(arr_lon[idx])
+    except Exception:
+        return None
 
@@ -1,5 +1,7 @@
 import os
 import time
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from skyfield.api import load, EarthSatellite
 from flask_app.app.tle_fetcher import fetch_tle  # Use your existing fetcher
@@ -7,8 +9,33 @@ from flask_app.app.tle_fetcher import fetch_tle  # Use your existing fetcher
 TLE_DIR = 'data/tle'
 SATELLITE_CSV = 'data/reference/sarsat_satellites.csv'
 
-# Cache for TLE-loaded Skyfield satellites
-satellite_objects = {}
+# Cache for TLE-loaded Skyfield satellites (LRU-bounded for long-running processes)
+SATELLITE_CACHE_MAX = int(os.getenv("RDS_SAT_CACHE_MAX", "8192"))
+satellite_objects = OrderedDict()
+# Per-file mtime and satellite names, so unchanged TLE files are not re-parsed
+_tle_file_mtimes = {}
+_tle_file_names = {}
+
+# Timescale loads IERS/leap-second data; build it once per process
+_TS = load.timescale()
+
+def _cache_satellite(name, satellite):
+    """Insert/refresh a satellite and evict the least recently used beyond SATELLITE_CACHE_MAX."""
+    satellite_objects[name] = satellite
+    satellite_objects.move_to_end(name)
+    while len(satellite_objects) > SATELLITE_CACHE_MAX:
+        evicted, _ = satellite_objects.popitem(last=False)
+        for file_path, names in _tle_file_names.items():
+            if evicted in names:
+                names.discard(evicted)
+                _tle_file_mtimes.pop(file_path, None)  # re-parse that file on the next load
+                break
+
+def clear_satellite_cache():
+    """Drop all loaded satellites; the next load_tle_data() re-parses every TLE file."""
+    satellite_objects.clear()
+    _tle_file_mtimes.clear()
+    _tle_file_names.clear()
 
 def load_satellite_metadata():
     """Load satellite metadata from CSV into a DataFrame."""
@@ -32,31 +59,39 @@ def ensure_fresh_tle():
         fetch_tle()
 
 def load_tle_data():
-    """Load TLE data into Skyfield satellite objects."""
-    global satellite_objects
-    satellite_objects.clear()
-
-    ts = load.timescale()
-
+    """Load TLE data into Skyfield satellite objects (only files whose mtime changed are re-parsed)."""
     for tle_file in ['sarsat.tle', 'gps.tle', 'galileo.tle', 'glonass.tle']:
         file_path = os.path.join(TLE_DIR, tle_file)
-        if os.path.exists(file_path):
-            with open(file_path) as f:
-                lines = f.readlines()
-            for i in range(0, len(lines), 3):
-                name = lines[i].strip()
-                line1 = lines[i+1].strip()
-                line2 = lines[i+2].strip()
-                satellite_objects[name] = EarthSatellite(line1, line2, name, ts)
+        mtime = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+        if mtime is not None and _tle_file_mtimes.get(file_path) == mtime:
+            continue
+
+        # Drop this file's previous satellites; re-parse if it still exists
+        for name in _tle_file_names.pop(file_path, []):
+            satellite_objects.pop(name, None)
+        _tle_file_mtimes.pop(file_path, None)
+        if mtime is None:
+            continue
+
+        names = set()
+        with open(file_path) as f:
+            it = iter(f)  # stream 3-line blocks; no readlines() copy of the whole file
+            for name, line1, line2 in zip(it, it, it):
+                name = name.strip()
+                _cache_satellite(name, EarthSatellite(line1.strip(), line2.strip(), name, _TS))
+                names.add(name)
+        _tle_file_names[file_path] = {n for n in names if n in satellite_objects}
+        if len(_tle_file_names[file_path]) == len(names):
+            _tle_file_mtimes[file_path] = mtime  # file fully cached; skip it until it changes
 
 def get_satellite_position(satellite_name, timestamp=None):
     """Get current or specified time position (lat, lon, alt) for a given satellite."""
     if satellite_name not in satellite_objects:
         raise ValueError(f"Satellite {satellite_name} not loaded from TLE data.")
+    satellite_objects.move_to_end(satellite_name)
 
     if timestamp is None:
-        ts = load.timescale()
-        timestamp = ts.now()
+        timestamp = _TS.now()
 
     satellite = satellite_objects[satellite_name]
     geocentric = satellite.at(timestamp)
@@ -71,19 +106,20 @@ def compute_ground_track(satellite_name, hours_back=1, hours_forward=3, step_min
     """Generate a ground track (list of lat/lon) for the past and future time range."""
     if satellite_name not in satellite_objects:
         raise ValueError(f"Satellite {satellite_name} not loaded from TLE data.")
+    satellite_objects.move_to_end(satellite_name)
 
-    ts = load.timescale()
+    ts = _TS
     now = ts.now()
 
-    times = []
-    for offset in range(-hours_back * 60, hours_forward * 60, step_minutes):
-        times.append(now + offset / (24 * 60))
+    # One Time array for the whole window -> a single SGP4 propagation call
+    offsets = np.arange(-hours_back * 60, hours_forward * 60, step_minutes) / (24 * 60)
+    times = ts.tt_jd(now.tt + offsets)
 
-    track = []
     satellite = satellite_objects[satellite_name]
-    for t in times:
-        geocentric = satellite.at(t)
-        subpoint = geocentric.subpoint()
-        track.append({
-            "timestamp": t.utc_iso(),
-            "la
+    subpoint = satellite.at(times).subpoint()
+    return [
+        {"timestamp": ts_iso, "latitude": lat, "longitude": lon}
+        for ts_iso, lat, lon in zip(times.utc_iso(),
+                                    subpoint.latitude.degrees.tolist(),
+                                    subpoint.longitude.degrees.tolist())
+    ]
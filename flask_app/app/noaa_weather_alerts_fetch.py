@@ -3,8 +3,95 @@
 from app.setup_imports import *
 from datetime import datetime
 
+import asyncio
+import os
 import requests
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HAS_HTTPX_HTTP2 = True
+except Exception:
+    HAS_HTTPX_HTTP2 = False
+
+# Shared keep-alive session: both api.weather.gov calls (and bulk lookups) reuse connections
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/geo+json"})
+# The HTTP/2 client gets only these (never requests' defaults): connection-specific headers such as
+# "Connection: keep-alive" are illegal in HTTP/2 and make h2 reject the request
+_HTTP2_HEADERS = {"Accept": "application/geo+json", "User-Agent": _SESSION.headers["User-Agent"]}
+ALERTS_BULK_WORKERS = int(os.getenv("RDS_ALERTS_BULK_WORKERS", "16"))
+# Bulk lookups multiplex over one HTTP/2 connection when httpx[http2] is installed (0 = threads only)
+ALERTS_HTTP2 = os.getenv("RDS_ALERTS_HTTP2", "1") == "1"
+
+# (lat, lon) rounded to 0.01 deg -> (forecastZone URL, fetched monotonic s). Zones are static,
+# so only the alerts call stays live; RDS_ZONE_CACHE_TTL_S=0 disables the cache.
+ZONE_CACHE_TTL_S = float(os.getenv("RDS_ZONE_CACHE_TTL_S", "3600"))
+ZONE_CACHE_MAXSIZE = 2048
+_ZONE_CACHE = OrderedDict()
+_ZONE_CACHE_LOCK = threading.Lock()
+
+
+def _zone_cache_get(key):
+    """(hit, zone_url) for a rounded (lat, lon) key; expired entries count as misses."""
+    with _ZONE_CACHE_LOCK:
+        hit = _ZONE_CACHE.get(key)
+        if hit is not None and time.monotonic() - hit[1] < ZONE_CACHE_TTL_S:
+            _ZONE_CACHE.move_to_end(key)
+            return True, hit[0]
+    return False, None
+
+
+def _zone_cache_put(key, zone_url):
+    if ZONE_CACHE_TTL_S <= 0:
+        return
+    with _ZONE_CACHE_LOCK:
+        _ZONE_CACHE[key] = (zone_url, time.monotonic())
+        _ZONE_CACHE.move_to_end(key)
+        while len(_ZONE_CACHE) > ZONE_CACHE_MAXSIZE:
+            _ZONE_CACHE.popitem(last=False)
+
+
+def _zone_key(lat, lon):
+    return round(float(lat), 2), round(float(lon), 2)
+
+
+def _lookup_zone_url(lat_q, lon_q):
+    """Resolve /points/{lat},{lon} to its forecastZone URL (None if the point has no zone); TTL-cached."""
+    key = (lat_q, lon_q)
+    hit, zone_url = _zone_cache_get(key)
+    if hit:
+        return zone_url
+
+    response = _SESSION.get(f"https://api.weather.gov/points/{lat_q},{lon_q}", timeout=10)
+    response.raise_for_status()
+    zone_url = response.json().get('properties', {}).get('forecastZone')
+    _zone_cache_put(key, zone_url)
+    return zone_url
+
+
+def _fetch_zone_headlines(zone_url):
+    """Headlines of the active alerts for one forecast zone."""
+    response = _SESSION.get(f"{zone_url}/alerts/active", timeout=10)
+    response.raise_for_status()
+    return _headlines(response.json())
+
+
+def _headlines(alerts_data):
+    return [alert['properties']['headline'] for alert in alerts_data.get('features', [])]
+
+
+def _log_zone_alerts(zone_url, alerts):
+    if alerts:
+        logging.info(f"ðŸš¨ Active weather alerts for zone {zone_url}: {alerts}")
+    else:
+        logging.info(f"âœ… No active weather alerts for zone {zone_url}")
+
 
 def fetch_weather_alerts_zone(lat, lon):
     """
@@ -19,28 +106,14 @@ def fetch_weather_alerts_zone(lat, lon):
     """
     try:
         # Fetch the grid point metadata to find the forecast zone
-        grid_url = f"https://api.weather.gov/points/{lat},{lon}"
-        response = requests.get(grid_url)
-        response.raise_for_status()
-        properties = response.json().get('properties', {})
-
-        zone_url = properties.get('forecastZone')
+        zone_url = _lookup_zone_url(*_zone_key(lat, lon))
         if not zone_url:
             logging.warning(f"âš ï¸ No forecast zone found for ({lat}, {lon})")
             return None, []
 
         # Fetch active alerts for the forecast zone
-        alerts_url = f"{zone_url}/alerts/active"
-        alerts_response = requests.get(alerts_url)
-        alerts_response.raise_for_status()
-
-        alerts_data = alerts_response.json()
-        alerts = [alert['properties']['headline'] for alert in alerts_data.get('features', [])]
-
-        if alerts:
-            logging.info(f"ðŸš¨ Active weather alerts for zone {zone_url}: {alerts}")
-        else:
-            logging.info(f"âœ… No active weather alerts for zone {zone_url}")
+        alerts = _fetch_zone_headlines(zone_url)
+        _log_zone_alerts(zone_url, alerts)
 
         return zone_url, alerts
 
@@ -48,3 +121,105 @@ def fetch_weather_alerts_zone(lat, lon):
         logging.error(f"âŒ Error fetching weather alerts for ({lat}, {lon}): {e}")
         return None, []
 
+
+def fetch_weather_alerts_bulk(coords, max_workers=None):
+    """
+    Fetches weather alerts for many positions concurrently.
+
+    Parameters:
+        coords (iterable of (lat, lon)): Positions to look up; duplicates are fetched once.
+        max_workers (int): Thread cap (default RDS_ALERTS_BULK_WORKERS).
+
+    Returns:
+        list: (zone_id, alerts) tuples in the same order as coords.
+    """
+    coords = [(lat, lon) for lat, lon in coords]
+    unique = list(dict.fromkeys(coords))
+    if not unique:
+        return []
+    if ALERTS_HTTP2 and HAS_HTTPX_HTTP2 and not _in_event_loop():
+        results = asyncio.run(_fetch_alerts_http2(unique))
+    else:
+        workers = max(1, min(max_workers or ALERTS_BULK_WORKERS, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = dict(zip(unique, ex.map(lambda c: fetch_weather_alerts_zone(*c), unique)))
+    return [results[c] for c in coords]
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+async def _get_json(client, url):
+    response = await client.get(url)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _fetch_alerts_http2(coords, transport=None):
+    """
+    Same results as fetch_weather_alerts_zone for each coord, but all /points lookups and then all
+    /alerts/active calls are issued concurrently as streams on one HTTP/2 connection.
+    transport overrides the httpx transport (tests).
+    """
+    results, zone_of, errors = {}, {}, {}
+    for lat, lon in coords:
+        try:
+            key = _zone_key(lat, lon)
+            hit, zone_url = _zone_cache_get(key)
+            zone_of[(lat, lon)] = (key, hit, zone_url)
+        except Exception as e:
+            errors[(lat, lon)] = e
+
+    limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    async with httpx.AsyncClient(http2=True, timeout=20, limits=limits,
+                                 headers=_HTTP2_HEADERS, transport=transport) as client:
+        client.headers.pop("Connection", None)  # httpx's own default; hop-by-hop, not valid in HTTP/2
+        # Phase 1: resolve uncached zones (one request per distinct rounded point)
+        missing = list(dict.fromkeys(key for key, hit, _ in zone_of.values() if not hit))
+        points = await asyncio.gather(
+            *[_get_json(client, f"https://api.weather.gov/points/{k[0]},{k[1]}") for k in missing],
+            return_exceptions=True)
+        resolved = {}
+        for key, payload in zip(missing, points):
+            if isinstance(payload, Exception):
+                resolved[key] = payload
+            else:
+                resolved[key] = payload.get('properties', {}).get('forecastZone')
+                _zone_cache_put(key, resolved[key])
+        for c, (key, hit, zone_url) in zone_of.items():
+            if not hit:
+                zone_of[c] = (key, True, resolved[key])
+
+        # Phase 2: active alerts per distinct zone, reusing the same connection
+        zones = list(dict.fromkeys(z for _, _, z in zone_of.values() if z and not isinstance(z, Exception)))
+        payloads = await asyncio.gather(*[_get_json(client, f"{z}/alerts/active") for z in zones],
+                                        return_exceptions=True)
+        zone_alerts = dict(zip(zones, payloads))
+
+    for lat, lon in coords:
+        c = (lat, lon)
+        try:
+            if c in errors:
+                raise errors[c]
+            zone_url = zone_of[c][2]
+            if isinstance(zone_url, Exception):
+                raise zone_url
+            if not zone_url:
+                logging.warning(f"âš ï¸ No forecast zone found for ({lat}, {lon})")
+                results[c] = (None, [])
+                continue
+            payload = zone_alerts[zone_url]
+            if isinstance(payload, Exception):
+                raise payload
+            alerts = _headlines(payload)
+            _log_zone_alerts(zone_url, alerts)
+            results[c] = (zone_url, alerts)
+        except Exception as e:
+            logging.error(f"âŒ Error fetching weather alerts for ({lat}, {lon}): {e}")
+            results[c] = (None, [])
+    return results
@@ -42,10 +42,9 @@ def fetch_nearest_weather_stations(lat, lon, position_label='A'):
 
         if weather_alerts_zone:
             logging.info(f"ðŸŒ Weather zone for Position {position_label}: {weather_alerts_zone}")
-            combined_stations['weather_alerts_zone'] = combined_stations.apply(
-                lambda row: weather_alerts_zone if pd.notna(row['zone']) and row['zone'] == weather_alerts_zone else np.nan,
-                axis=1
-            )
+            # Vectorized: keep the zone where it matches the alert zone, NaN elsewhere (incl. missing zones)
+            zone = combined_stations['zone']
+            combined_stations['weather_alerts_zone'] = zone.where(zone == weather_alerts_zone)
 
         return combined_stations
 
@@ -76,12 +75,13 @@ def _filter_complete_weather_stations(stations_df):
     if stations_df.empty:
         return stations_df
 
-    stations_df['has_data'] = stations_df.apply(
-        lambda row: not all(pd.isna(row[col]) for col in ['temperature', 'wind_speed', 'wave_height']),
-        axis=1
-    )
+    cols = [c for c in ['temperature', 'wind_speed', 'wave_height'] if c in stations_df.columns]
+    if not cols:
+        return stations_df
 
-    return stations_df[stations_df['has_data']].drop(columns=['has_data'])
+    # One column-wise reduction instead of a per-row apply; no temporary has_data column
+    mask = stations_df[cols].notna().to_numpy().any(axis=1)
+    return stations_df[mask]
 
 
 
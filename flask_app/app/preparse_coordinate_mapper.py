@@ -11,7 +11,7 @@
 # 
 # Internal Variables:
 # - raw_message: Full SARSAT message text.
-# - coordinate_pairs: List to store detected coordinate pairs.
+# - coordinate_pairs: Column lists (one per output column) for detected coordinate pairs.
 # - coord_df: Pandas DataFrame storing parsed coordinate data.
 # 
 # Produced DataFrames:
@@ -31,19 +31,56 @@
 # - Detects and allows unexpected characters between lat/lon pairs while maintaining correct matching.
 # - Uses NSEW explicitly to identify lat vs lon rather than assuming order.
 # - Supports all observed SARSAT coordinate formats, including Decimal Degrees and DMS with symbols.
+# - Decimal-minutes pairs (the common case) are taken straight from the pair regex captures and converted
+#   in one vectorized pass; other lines still go through validate_and_extract_coordinate_pair.
 #
 
 from app.setup_imports import *
+import bisect
+from itertools import accumulate
 
-from app.utils_coordinates import clean_and_standardize_coordinate
+from app.utils_coordinates import clean_and_standardize_coordinate, coordinate_pairs_to_dd
 from app.field_validator import (
     validate_and_extract_coordinate_token,
     validate_and_extract_coordinate_pair,
+    _PAIR_DEC_MIN_RE,
+    _MINUTES_FRAGMENT_RE,
 )
 
 def _short(s, n=200):
     return (s or "")[:n]
 
+# Every coordinate token the pair validator accepts ends in a digit, optional quote/space separators
+# and a hemisphere letter; a line can only yield a valid pair if it holds both an N/S and an E/W one.
+_HEMI_HINT_RE = re.compile(r"\d[\s'\"]*([NSEW])", re.IGNORECASE)
+
+def _candidate_lines(raw_message):
+    """Line indices (splitlines numbering) holding both an N/S and an E/W hemisphere token; one finditer."""
+    line_starts = list(accumulate((len(l) for l in raw_message.splitlines(keepends=True)), initial=0))
+    ns_lines, ew_lines = set(), set()
+    for m in _HEMI_HINT_RE.finditer(raw_message):
+        idx = bisect.bisect_right(line_starts, m.start(1)) - 1
+        (ns_lines if m.group(1) in "NSns" else ew_lines).add(idx)
+    return sorted(ns_lines & ew_lines)
+
+def _fill_decimal_minutes_rows(coordinate_pairs, rows):
+    """Vectorized lat_dd/lon_dd (+ validator-equivalent notes) for rows taken from decimal-minutes captures."""
+    lat_dd, lon_dd = coordinate_pairs_to_dd([coordinate_pairs["lat"][i] for i in rows],
+                                            [coordinate_pairs["lon"][i] for i in rows])
+    lat_ok = (lat_dd >= -90.0) & (lat_dd <= 90.0)
+    lon_ok = (lon_dd >= -180.0) & (lon_dd <= 180.0)
+    for k, i in enumerate(rows):
+        notes = ["lat: Matched decimal-minutes format"]
+        if not lat_ok[k]:
+            notes.append("lat: range: out of bounds")
+        notes.append("lon: Matched decimal-minutes format")
+        if not lon_ok[k]:
+            notes.append("lon: range: out of bounds")
+        notes.append("Matched pair decimal-minutes format")
+        coordinate_pairs["lat_dd"][i] = float(lat_dd[k])
+        coordinate_pairs["lon_dd"][i] = float(lon_dd[k])
+        coordinate_pairs["notes"][i] = _short("; ".join(notes), 120)
+
 def pre_scan_for_coordinates(raw_message):
     """
     Pre-scans the SARSAT message to detect and map potential coordinate pairs.
@@ -65,11 +102,40 @@ def pre_scan_for_coordinates(raw_message):
 
 
     import os
-    coordinate_pairs = []
+    # Build columns directly (struct-of-arrays) instead of a list of per-pair dicts
+    columns = ["lat", "lon", "lat_dd", "lon_dd", "start_pos", "end_pos", "format_type", "is_valid", "confidence", "notes"]
+    coordinate_pairs = {c: [] for c in columns}
     lines = raw_message.splitlines()
-    offset = 0  # Running character offset for global spans
+    # Running character offset for global spans (line length + 1 for newline)
+    offsets = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    dm_rows = []  # rows filled from decimal-minutes captures; lat_dd/lon_dd/notes set after the loop
+
+    # Scan the whole message once for hemisphere tokens; validate only lines that can hold a pair
+    for line_idx in _candidate_lines(raw_message):
+        line = lines[line_idx]
+        offset = offsets[line_idx]
+
+        # Fast path: same pair-first decimal-minutes match the validator tries first, without its
+        # per-token re-validation (dd values are computed for all such rows at once below)
+        std = clean_and_standardize_coordinate(line)
+        m = _PAIR_DEC_MIN_RE.search(std)
+        if m:
+            lat_token = m.group("lat") or m.group("lat2")
+            lon_token = m.group("lon") or m.group("lon2")
+            if not (_MINUTES_FRAGMENT_RE.match(lat_token) or _MINUTES_FRAGMENT_RE.match(lon_token)):
+                dm_rows.append(len(coordinate_pairs["lat"]))
+                coordinate_pairs["lat"].append(lat_token)
+                coordinate_pairs["lon"].append(lon_token)
+                coordinate_pairs["lat_dd"].append(None)
+                coordinate_pairs["lon_dd"].append(None)
+                coordinate_pairs["start_pos"].append(offset + m.start())
+                coordinate_pairs["end_pos"].append(offset + m.end())
+                coordinate_pairs["format_type"].append("Decimal Minutes")
+                coordinate_pairs["is_valid"].append(True)
+                coordinate_pairs["confidence"].append(0.92)
+                coordinate_pairs["notes"].append(None)
+                continue
 
-    for line_idx, line in enumerate(lines):
         result = validate_and_extract_coordinate_pair(
             field_name="coord_pair",
             raw_text=line,
@@ -85,24 +151,26 @@ def pre_scan_for_coordinates(raw_message):
             # Compute global spans
             start_pos = offset + (result.get("start_pos") if result.get("start_pos") is not None else 0)
             end_pos = offset + (result.get("end_pos") if result.get("end_pos") is not None else len(line))
-            coordinate_pairs.append({
-                "lat": lat_val,
-                "lon": lon_val,
-                "lat_dd": result.get("lat_dd"),
-                "lon_dd": result.get("lon_dd"),
-                "start_pos": start_pos,
-                "end_pos": end_pos,
-                "format_type": result.get("format_type", "Unknown"),
-                "is_valid": result.get("is_valid"),
-                "confidence": result.get("confidence", 0.0),
-                "notes": _short("; ".join(result.get("notes", [])), 120)
-            })
+            coordinate_pairs["lat"].append(lat_val)
+            coordinate_pairs["lon"].append(lon_val)
+            coordinate_pairs["lat_dd"].append(result.get("lat_dd"))
+            coordinate_pairs["lon_dd"].append(result.get("lon_dd"))
+            coordinate_pairs["start_pos"].append(start_pos)
+            coordinate_pairs["end_pos"].append(end_pos)
+            coordinate_pairs["format_type"].append(result.get("format_type", "Unknown"))
+            coordinate_pairs["is_valid"].append(result.get("is_valid"))
+            coordinate_pairs["confidence"].append(result.get("confidence", 0.0))
+            coordinate_pairs["notes"].append(_short("; ".join(result.get("notes", [])), 120))
             # Deterministic: stop on first valid pair per line
-        offset += len(line) + 1  # +1 for newline
+
+    if dm_rows:
+        _fill_decimal_minutes_rows(coordinate_pairs, dm_rows)
 
     # Build DataFrame with fixed column order
-    columns = ["lat", "lon", "lat_dd", "lon_dd", "start_pos", "end_pos", "format_type", "is_valid", "confidence", "notes"]
-    coord_df = pd.DataFrame(coordinate_pairs, columns=columns)
+    if coordinate_pairs["lat"]:
+        coord_df = pd.DataFrame(coordinate_pairs, columns=columns)
+    else:
+        coord_df = pd.DataFrame(columns=columns)  # empty lists would otherwise infer float64
 
     # Ensure output directory exists
     debug_csv_path = os.path.abspath("data/debugging/debug_preparsed_coordinates.csv")
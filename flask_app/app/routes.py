@@ -5,7 +5,8 @@ import os
 from flask import Blueprint, render_template, request, jsonify, send_file, send_from_directory, current_app, redirect, url_for, abort
 from flask_app.app.parser import parse_sarsat_message  # Ensure proper import
 from flask_app.app.database import save_alert_to_db  # Ensure proper import
-from flask_app.app.gis_plot import generate_gis_map
+from flask_app.app.gis_mapping import generate_gis_map
+from flask_app.app.gis_render_queue import submit_map_job, get_map_job
 import pandas as pd
 
 from flask_app.app.weather_fetch import fetch_nearest_weather_stations
@@ -81,10 +82,48 @@ def gis_map(latitude, longitude, site_id):
         print(f"🚨 ERROR: Invalid parameters received -> Latitude: {latitude}, Longitude: {longitude}, Site ID: {site_id}")
         return jsonify({"error": "Invalid parameters"}), 400
 
-    generate_gis_map(latitude_float, longitude_float, site_id_int)
-
-    return redirect(url_for('main.serve_map', filename=f'gis_map_{site_id_int}.html'))
-
+    # ✅ Render off the request thread; client polls /gis_map_status/<job_id>
+    maps_dir = os.path.abspath(os.path.join(current_app.root_path, "..", "maps"))
+    os.makedirs(maps_dir, exist_ok=True)
+    filename = f'gis_map_{site_id_int}.html'
+    alert_row = {
+        "site_id": site_id_int,
+        "latitude_a": latitude_float, "longitude_a": longitude_float,
+        "latitude_b": float("nan"), "longitude_b": float("nan"),
+        "range_ring_meters_a": 0, "range_ring_meters_b": 0,
+    }
+    job_id = submit_map_job(generate_gis_map, alert_row, os.path.join(maps_dir, filename))
+
+    return jsonify({
+        "job_id": job_id,
+        "status_url": url_for('main.gis_map_status', job_id=job_id),
+        "map_url": url_for('main.serve_map', filename=filename),
+    }), 202
+
+
+@main_bp.route('/gis_map_status/<job_id>', methods=['GET'])
+def gis_map_status(job_id):
+    """Poll a queued GIS map job; includes map_url once the HTML is written."""
+    job = get_map_job(job_id)
+    if job["status"] == "unknown":
+        return jsonify(job), 404
+    if job["status"] == "done" and job["result"]:
+        filename = os.path.basename(job["result"])
+        if filename.endswith(".gz"):
+            filename = filename[:-3]  # serve_map picks the .gz (gzip-encoded when the client accepts it)
+        job["map_url"] = url_for('main.serve_map', filename=filename)
+    return jsonify(job)
+
+
+
+@main_bp.route('/tiles/coastline/<int:z>/<int:x>/<int:y>.png')
+def coastline_tile(z, x, y):
+    """Serve pre-rendered coastline XYZ tiles from <RDS_DATA_FOLDER>/tiles/coastline (see RDS_COASTLINE_TILES_URL)."""
+    tiles_dir = os.path.join(os.getenv('RDS_DATA_FOLDER', 'data'), 'tiles', 'coastline')
+    tile = os.path.join(str(z), str(x), f"{y}.png")
+    if not os.path.exists(os.path.join(tiles_dir, tile)):
+        return abort(404, description="Tile not found")
+    return send_from_directory(os.path.abspath(tiles_dir), tile, max_age=86400)
 
 
 @main_bp.route('/maps/<path:filename>')  # ✅ Use <path:filename> to handle file paths
@@ -92,14 +131,34 @@ def serve_map(filename):
     """Serve GIS map files from the maps directory."""
     import os
     from flask import send_from_directory, current_app, abort
+    from werkzeug.security import safe_join
 
     maps_dir = os.path.abspath(os.path.join(current_app.root_path, "..", "maps"))
 
+    # ✅ Resolve inside maps_dir only (rejects ../ and absolute paths) before touching the filesystem
+    file_path = safe_join(maps_dir, filename)
+    gz_path = safe_join(maps_dir, filename + ".gz")
+    if file_path is None or gz_path is None:
+        return abort(404, description="File not found")
 
     # ✅ Debugging: Print the exact file path Flask is checking
-    file_path = os.path.join(maps_dir, filename)
     print(f"✅ DEBUG: Flask is trying to serve file: {file_path}")
 
+    # ✅ Maps stored gzip-compressed at rest (RDS_MAP_GZIP=1): serve the .gz when it is the newer variant,
+    # as-is for clients that accept gzip, decompressed for those that don't
+    if os.path.exists(gz_path) and (not os.path.exists(file_path)
+                                    or os.path.getmtime(gz_path) >= os.path.getmtime(file_path)):
+        if "gzip" in request.accept_encodings:
+            response = send_from_directory(maps_dir, filename + ".gz", mimetype="text/html")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            import gzip
+            from flask import Response
+            with gzip.open(gz_path, "rb") as fh:
+                response = Response(fh.read(), mimetype="text/html")
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
     # ✅ Check if the file actually exists before serving it
     if not os.path.exists(file_path):
         print(f"🚨 ERROR: Flask cannot find the file -> {file_path}")
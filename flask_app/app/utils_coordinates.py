@@ -1,5 +1,7 @@
 ﻿import re
 import logging
+import numpy as np
+import pandas as pd
 from app.utils import log_error_and_continue
 
 def is_valid_coordinate(coord_string):
@@ -33,6 +35,38 @@ def parse_any_coordinate(coord_string: str) -> float:
     if m.group(4) in ("S", "W"): dd *= -1
     return dd
 
+# Same token grammar as parse_any_coordinate (deg, minutes, optional seconds, hemisphere)
+_DM_TOKEN_RE = re.compile(r"^(\d{1,3})\s+(\d{1,2}(?:\.\d+)?)(?:\s+(\d{1,2}(?:\.\d+)?))?\s*([NSEW])$")
+
+def coordinates_to_dd(coord_strings):
+    """
+    Batch parse_any_coordinate: array-like of tokens -> float64 array of signed decimal degrees.
+    One vectorized extract + numpy arithmetic; NaN where a token does not parse (instead of raising).
+    """
+    s = pd.Series(coord_strings, dtype="object").fillna("").astype(str)
+    s = s.str.strip().str.upper().str.replace(r"\s+", " ", regex=True)
+    parts = s.str.extract(_DM_TOKEN_RE)
+    deg = parts[0].astype(float).to_numpy()
+    minutes = parts[1].astype(float).to_numpy()
+    seconds = parts[2].astype(float).fillna(0.0).to_numpy()
+    dd = deg + minutes / 60.0 + seconds / 3600.0
+    dd[(minutes >= 60) | (seconds >= 60)] = np.nan
+    hemi = parts[3].to_numpy()
+    return np.where((hemi == "S") | (hemi == "W"), -dd, dd)
+
+def coordinate_pairs_to_dd(lat_strings, lon_strings):
+    """
+    Batch convert matched lat/lon tokens -> (lat_dd, lon_dd) float64 arrays.
+    A latitude must end in N/S and a longitude in E/W; anything else is NaN.
+    """
+    lat_dd = coordinates_to_dd(lat_strings)
+    lon_dd = coordinates_to_dd(lon_strings)
+    lat_hemi = pd.Series(lat_strings, dtype="object").fillna("").astype(str).str.strip().str[-1:].str.upper()
+    lon_hemi = pd.Series(lon_strings, dtype="object").fillna("").astype(str).str.strip().str[-1:].str.upper()
+    lat_dd[~lat_hemi.isin(["N", "S"]).to_numpy()] = np.nan
+    lon_dd[~lon_hemi.isin(["E", "W"]).to_numpy()] = np.nan
+    return lat_dd, lon_dd
+
 def coordinate_pair_to_dd(coord_string):
     """
     Parses a combined lat/lon string into decimal degrees, tolerating variable spacing.
@@ -3,6 +3,7 @@
 # Last Updated (UTC): 2025-09-15
 # Update Summary:
 #   - Initial implementation of display and conversion helpers for weather and GIS.
+#   - Added format_us_display_vec (column-wise twin of format_us_display).
 # Description:
 #   - Provides pure helpers for timezone resolution, dual time formatting, US display conversions,
 #     and maritime proximity checks (stub).
@@ -129,6 +130,35 @@ def format_us_display(
     else:                   out["temp_display"] = "None"
     return out
 
+def _as_float_array(x) -> np.ndarray:
+    """Any scalar/list/Series → float ndarray; non-numeric and None become NaN."""
+    return pd.to_numeric(pd.Series(np.asarray(x, dtype=object).ravel()), errors="coerce").to_numpy(dtype=float)
+
+def format_us_display_vec(wave_height_m, wind_ms, temp_C) -> pd.DataFrame:
+    """
+    Column-wise format_us_display(): one call for whole Series/arrays of wave height (m),
+    wind (m/s) and temperature (°C), all the same length.
+    Returns a DataFrame with wave_height_display / wind_display / temp_display holding the same
+    strings format_us_display() gives per row ("None" where missing). Keeps the index of wave_height_m
+    when it is a Series.
+    """
+    index = wave_height_m.index if isinstance(wave_height_m, pd.Series) else None
+    feet = _as_float_array(wave_height_m) * 3.28084
+    knots = _as_float_array(wind_ms) * 1.94384
+    tc = _as_float_array(temp_C)
+    tf = tc * 9.0 / 5.0 + 32.0
+
+    has_wave, has_wind, has_t = ~np.isnan(feet), ~np.isnan(knots), ~np.isnan(tc)
+    wave_txt = np.where(has_wave, np.char.add(np.char.mod("%.1f", feet), " ft"), "None")
+    wind_txt = np.where(has_wind, np.char.add(np.char.mod("%.0f", knots), " kt"), "None")
+    temp_txt = np.where(has_t, np.char.add(np.char.add(np.char.mod("%.0f", tf), " °F / "),
+                                           np.char.add(np.char.mod("%.1f", tc), " °C")), "None")
+    return pd.DataFrame({
+        "wave_height_display": wave_txt.astype(object),
+        "wind_display": wind_txt.astype(object),
+        "temp_display": temp_txt.astype(object),
+    }, index=index)
+
 def is_maritime(lat: float, lon: float, shore_nm: float = 5.0) -> bool:
     """
     Stub: Returns False. Intended to compute proximity to coastline.
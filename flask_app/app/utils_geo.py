@@ -32,6 +32,18 @@ def haversine_km(lat1, lon1, lat2, lon2):
     a = np.sin(dphi / 2) ** 2 + np.cos(p[0]) * np.cos(p[2]) * np.sin(dlmb / 2) ** 2
     return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
 
+def haversine_nm_vec(lat, lon, lats, lons):
+    """
+    Great-circle distance in nautical miles from one point to arrays of points.
+    One numpy pass over lats/lons (NaN coordinates give NaN distances).
+    """
+    lat1 = np.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(lons, dtype=float) - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(a))
+
 def within_nm(lat1, lon1, lat2, lon2, nm_threshold: float):
     """
     Returns True if the distance between two points is <= nm_threshold nautical miles.
@@ -1,13 +1,14 @@
 ﻿# Script Name: wx_fetch_meteostat.py
 # APPLY TEST - selection scope
 # Last Updated: 2025-09-11 1:09pm
-# Update Summary: Fix timezone normalization to prevent TypeError, add debug breadcrumbs, enforce DataFrame return rules.
+# Update Summary: Fix timezone normalization to prevent TypeError, add debug breadcrumbs, enforce DataFrame return rules. Memoize nearby-station lookups per 0.01-degree cell.
 # Description: Fetches hourly weather data from Meteostat stations near a target site, normalizes timestamps, trims to time window, and returns DataFrame.
 # External Data Sources: Meteostat API.
 # Internal Variables: site_id (str), start_utc (datetime, tz-aware), end_utc (datetime, tz-aware).
 # Produced DataFrames: weather_data_df (columns: station_id, observation_time, temp_c, dewpoint_c, rh_pct, wind_ms, wind_dir_deg, wind_gust_ms, pressure_hpa).
 # Data Handling Notes: Always returns DataFrame (empty if failure), timestamps tz-aware UTC, NaN for missing values.
 import pandas as pd
+from functools import lru_cache
 
 from app.setup_imports import *
 from app.utils_geo import haversine_km
@@ -21,7 +22,13 @@ try:
 except Exception:
     _HAS_METEOSTAT = False
 
-    
+
+@lru_cache(maxsize=512)
+def _nearby_stations(lat_q: float, lon_q: float, limit: int) -> pd.DataFrame:
+    """Stations().nearby() downloads/parses the station list on every call; cache per quantized cell."""
+    return Stations().nearby(lat_q, lon_q).fetch(limit)
+
+
 def fetch_meteostat_obs_near(lat: float, lon: float, start_utc, end_utc,
                              radius_km: float = 50.0, max_stations: int = 5) -> pd.DataFrame:
     cols = [
@@ -43,7 +50,9 @@ def fetch_meteostat_obs_near(lat: float, lon: float, start_utc, end_utc,
     start_utc, end_utc = coerce_utc_range(start_utc, end_utc)
 
     try:
-        stations_df = Stations().nearby(lat, lon).fetch(max_stations * 3)
+        # Cached frame is shared between calls: copy before adding dist_km
+        stations_df = _nearby_stations(round(float(lat), 2), round(float(lon), 2), max_stations * 3)
+        stations_df = stations_df.copy() if stations_df is not None else None
         LOG.debug("Meteostat stations: cols=%s index.name=%s shape=%s",
                   list(stations_df.columns), stations_df.index.name, stations_df.shape)
         if stations_df is None or len(stations_df) == 0:
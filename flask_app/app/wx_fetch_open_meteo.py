@@ -2,6 +2,7 @@
 # Last Updated (UTC): 2025-09-02
 # Update Summary:
 # â€¢ New: Open-Meteo model+marine hourly fetcher (point samples) â†’ wx_obs rows
+# â€¢ Requests go through one module-level keep-alive Session (TLS reused across calls).
 # Description:
 # â€¢ Fetches hourly weather + optional waves at (lat, lon) and normalizes to wx_obs schema.
 # External Data Sources:
@@ -24,6 +25,11 @@ from app.utils_weather import dewpoint_magnus_c
 
 LOG = logging.getLogger(__name__)
 
+# One keep-alive session per process: repeated fetches (health checks, per-alert wx) reuse
+# the TCP/TLS connections to both Open-Meteo hosts instead of handshaking on every call.
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 def fetch_open_meteo_obs(lat: float, lon: float, start_utc, end_utc, include_marine: bool = True) -> pd.DataFrame:
     start_utc = _to_utc(start_utc)
     end_utc = _to_utc(end_utc)
@@ -55,7 +61,7 @@ def fetch_open_meteo_obs(lat: float, lon: float, start_utc, end_utc, include_mar
         "end_date": end_utc.strftime("%Y-%m-%d")
     }
     try:
-        r = requests.get("https://api.open-meteo.com/v1/forecast", params=wx_params, timeout=20)
+        r = _SESSION.get("https://api.open-meteo.com/v1/forecast", params=wx_params, timeout=20)
         r.raise_for_status()
         j = r.json()
     except Exception as e:
@@ -70,7 +76,7 @@ def fetch_open_meteo_obs(lat: float, lon: float, start_utc, end_utc, include_mar
     m_map = {}
     if include_marine:
         try:
-            rm = requests.get("https://marine-api.open-meteo.com/v1/marine", params={
+            rm = _SESSION.get("https://marine-api.open-meteo.com/v1/marine", params={
                 "latitude": lat, "longitude": lon,
                 "hourly": "wave_height,wave_direction,wave_period",
                 "timezone": "UTC",
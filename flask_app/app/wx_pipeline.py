@@ -160,7 +160,7 @@ if __name__ == "__main__":
 
                 # Center map on first point
                 center_lat, center_lon = df_wx_obs.iloc[0]["lat"], df_wx_obs.iloc[0]["lon"]
-                fmap = folium.Map(location=[center_lat, center_lon], zoom_start=8)
+                fmap = folium.Map(location=[center_lat, center_lon], zoom_start=8, prefer_canvas=True)
 
                 for _, row in df_wx_obs.iterrows():
                     lat, lon = row["lat"], row["lon"]
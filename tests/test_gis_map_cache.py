@@ -0,0 +1,32 @@
+# tests/test_gis_map_cache.py
+import app.gis_mapping as gis_mapping
+
+
+def _alert(site_id="S1", lat_a=10.0):
+    return {"site_id": site_id, "latitude_a": lat_a, "longitude_a": 20.0,
+            "latitude_b": float("nan"), "longitude_b": float("nan"),
+            "range_ring_meters_a": 0, "range_ring_meters_b": 0}
+
+
+def test_generate_gis_map_reuses_cached_html_until_an_input_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(gis_mapping, "MAP_CACHE_ENABLED", True)
+    monkeypatch.setattr(gis_mapping, "MAP_GZIP", False)
+    monkeypatch.setattr(gis_mapping, "_MAP_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.delenv("RDS_OPERATOR_TZ", raising=False)
+    renders = []
+    real_save = gis_mapping._save_map
+    monkeypatch.setattr(gis_mapping, "_save_map", lambda *a, **k: renders.append(1) or real_save(*a, **k))
+
+    first = gis_mapping.generate_gis_map(_alert(), str(tmp_path / "first.html"))
+    hit = gis_mapping.generate_gis_map(_alert(), str(tmp_path / "hit.html"))
+    assert len(renders) == 1
+    assert (tmp_path / "hit.html").read_bytes() == (tmp_path / "first.html").read_bytes()
+    assert hit == str(tmp_path / "hit.html") and first == str(tmp_path / "first.html")
+
+    gis_mapping.generate_gis_map(_alert(lat_a=11.0), str(tmp_path / "moved.html"))
+    assert len(renders) == 2
+
+    monkeypatch.setenv("RDS_OPERATOR_TZ", "America/New_York")
+    gis_mapping.generate_gis_map(_alert(), str(tmp_path / "tz.html"))
+    assert len(renders) == 3
+    assert len(list((tmp_path / "cache").glob("*.html"))) == 3
@@ -0,0 +1,41 @@
+# tests/test_gis_mapping_canvas.py
+import pandas as pd
+import app.gis_mapping as gis_mapping
+
+
+def test_dfs_map_prefers_canvas_and_batches_rings(tmp_path, monkeypatch):
+    monkeypatch.setattr(gis_mapping, "MAP_CACHE_ENABLED", False)
+    df = pd.DataFrame([
+        {"layer": "alert_position", "label": "A",
+         "geometry": {"type": "Point", "coordinates": [-70.2, 38.25]}},
+        {"layer": "range_ring", "label": "A",
+         "geometry": {"type": "Circle", "center": [-70.2, 38.25], "radius_m": 3704}},
+        {"layer": "range_ring", "label": "B",
+         "geometry": {"type": "Circle", "center": [-71.0, 37.9], "radius_m": 5000}},
+    ])
+    out = tmp_path / "map.html"
+    res = gis_mapping.generate_gis_map_html_from_dfs(df, {"site_id": "T1"}, str(out), tiles_mode="offline")
+    assert res["status"] == "ok"
+    html = out.read_text(encoding="utf-8")
+    assert '"preferCanvas": true' in html
+    assert html.count('"type": "Polygon"') == 2   # both rings ...
+    assert "L.circle(" not in html                # ... in one GeoJson layer, no per-ring Circle
+
+
+def test_dfs_map_fetches_sat_tracks_from_sidecar_geojson(tmp_path, monkeypatch):
+    monkeypatch.setattr(gis_mapping, "SAT_GEOJSON_EXTERNAL", True)
+    df = pd.DataFrame([
+        {"layer": "alert_position", "label": "A",
+         "geometry": {"type": "Point", "coordinates": [-70.2, 38.25]}},
+        {"layer": "satellite_overlay", "label": "SARSAT 13 (LEO)", "sat_type": "LEO",
+         "geometry": {"type": "LineString", "coordinates": [[-71.123456, 37.5], [-69.654321, 39.5]]}},
+    ])
+    out = tmp_path / "map.html"
+    res = gis_mapping.generate_gis_map_html_from_dfs(df, {"site_id": "T1"}, str(out), tiles_mode="offline")
+    assert res["status"] == "ok"
+    html = out.read_text(encoding="utf-8")
+    sidecar = tmp_path / "map.sat_tracks_leo.geojson"
+    assert sidecar.exists()
+    assert '"SARSAT 13 (LEO)"' in sidecar.read_text(encoding="utf-8")
+    assert 'fetch("map.sat_tracks_leo.geojson")' in html
+    assert "-71.12" not in html   # track coordinates are not inlined
@@ -0,0 +1,28 @@
+# tests/test_gis_render_queue.py
+import time
+from app.gis_render_queue import submit_map_job, get_map_job
+
+
+def _wait(job_id, timeout=5.0):
+    t0 = time.time()
+    while time.time() - t0 < timeout:
+        job = get_map_job(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+    return get_map_job(job_id)
+
+
+def test_map_job_done_returns_result():
+    job = _wait(submit_map_job(lambda p: p, "data/maps/TEST/gis_map_TEST.html"))
+    assert job["status"] == "done"
+    assert job["result"].endswith("gis_map_TEST.html")
+
+
+def test_map_job_error_and_unknown():
+    def boom():
+        raise RuntimeError("render failed")
+    job = _wait(submit_map_job(boom))
+    assert job["status"] == "error"
+    assert "render failed" in job["error"]
+    assert get_map_job("nope")["status"] == "unknown"
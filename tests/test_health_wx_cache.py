@@ -0,0 +1,47 @@
+# tests/test_health_wx_cache.py
+import pandas as pd
+
+import app.health_wx as health_wx
+
+
+def test_health_check_reuses_cached_provider_frames(tmp_path, monkeypatch):
+    monkeypatch.setattr(health_wx, "WX_CACHE_ENABLED", True)
+    monkeypatch.setattr(health_wx, "WX_CACHE_PATH", str(tmp_path / "cache" / "wx.sqlite"))
+    monkeypatch.setattr(health_wx, "_WX_CACHE", None)
+    monkeypatch.setattr(health_wx, "HAS_METEOSTAT", False)
+    calls = []
+
+    def fake_open_meteo(lat, lon, start_utc, end_utc, include_marine=True):
+        calls.append((lat, lon))
+        return pd.DataFrame({"valid_utc": [end_utc], "lat": [lat], "lon": [lon],
+                             "provider": ["Open-Meteo"], "source_type": ["model"]})
+
+    monkeypatch.setattr(health_wx, "fetch_open_meteo_obs", fake_open_meteo)
+
+    first = health_wx.run_wx_health_check(47.6, -122.3, hours=6)
+    second = health_wx.run_wx_health_check(47.6, -122.3, hours=6)
+
+    assert len(calls) == 1
+    assert first["open_meteo"] == second["open_meteo"]
+    assert second["open_meteo"]["rows"] == 1
+
+
+def test_health_check_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(health_wx, "WX_CACHE_ENABLED", False)
+    monkeypatch.setattr(health_wx, "WX_CACHE_PATH", str(tmp_path / "wx.sqlite"))
+    monkeypatch.setattr(health_wx, "_WX_CACHE", None)
+    monkeypatch.setattr(health_wx, "HAS_METEOSTAT", False)
+    calls = []
+
+    def fake_open_meteo(lat, lon, start_utc, end_utc, include_marine=True):
+        calls.append((lat, lon))
+        return pd.DataFrame({"valid_utc": [end_utc], "lat": [lat], "lon": [lon],
+                             "provider": ["Open-Meteo"], "source_type": ["model"]})
+
+    monkeypatch.setattr(health_wx, "fetch_open_meteo_obs", fake_open_meteo)
+
+    health_wx.run_wx_health_check(47.6, -122.3, hours=6)
+    health_wx.run_wx_health_check(47.6, -122.3, hours=6)
+
+    assert len(calls) == 2
+    assert not (tmp_path / "wx.sqlite").exists()
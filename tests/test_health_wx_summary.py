@@ -0,0 +1,25 @@
+# tests/test_health_wx_summary.py
+import pandas as pd
+
+import app.health_wx as health_wx
+
+
+def _frame(valid_utc):
+    return pd.DataFrame({"valid_utc": valid_utc, "lat": 1.0, "lon": 2.0,
+                         "provider": "Open-Meteo", "source_type": "model"})
+
+
+def test_summary_keeps_timestamps_and_adds_epoch_ns():
+    ts = pd.date_range("2025-01-01", periods=3, freq="h", tz="UTC")
+    out = health_wx._summarize_df(_frame(ts))
+    assert out["min_ts"] == ts[0] and out["max_ts"] == ts[-1]
+    assert isinstance(out["min_ts"], pd.Timestamp) and str(out["max_ts"].tz) == "UTC"
+    assert out["min_ts_ns"] == ts[0].value and out["max_ts_ns"] == ts[-1].value
+    assert out["missing_cols"] == []
+
+
+def test_summary_span_is_none_without_valid_times():
+    out = health_wx._summarize_df(_frame([None, None]))
+    assert out["rows"] == 2
+    assert out["min_ts"] is None and out["min_ts_ns"] is None and out["max_ts_ns"] is None
+    assert health_wx._empty_summary()["min_ts_ns"] is None
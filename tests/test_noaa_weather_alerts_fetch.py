@@ -0,0 +1,80 @@
+# tests/test_noaa_weather_alerts_fetch.py
+import asyncio
+
+import pytest
+
+import app.noaa_weather_alerts_fetch as alerts_fetch
+
+
+class _Resp:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def test_bulk_alerts_keep_order_and_fetch_duplicates_once(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        if "/points/" in url:
+            lat = url.rsplit("/", 1)[-1].split(",")[0]
+            return _Resp({"properties": {"forecastZone": f"https://zone/{lat}"}})
+        return _Resp({"features": [{"properties": {"headline": f"Gale {url.split('/')[-3]}"}}]})
+
+    monkeypatch.setattr(alerts_fetch._SESSION, "get", fake_get)
+    monkeypatch.setattr(alerts_fetch, "_ZONE_CACHE", alerts_fetch.OrderedDict())
+    monkeypatch.setattr(alerts_fetch, "HAS_HTTPX_HTTP2", False)  # thread path: stays on the patched session
+
+    out = alerts_fetch.fetch_weather_alerts_bulk([(47.6, -122.3), (40.0, -70.0), (47.6, -122.3)])
+
+    assert out[0] == ("https://zone/47.6", ["Gale 47.6"])
+    assert out[1] == ("https://zone/40.0", ["Gale 40.0"])
+    assert out[2] == out[0]
+    assert len(calls) == 4
+
+
+def test_zone_lookup_is_cached_per_rounded_point(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        if "/points/" in url:
+            return _Resp({"properties": {"forecastZone": "https://zone/PZZ135"}})
+        return _Resp({"features": []})
+
+    monkeypatch.setattr(alerts_fetch._SESSION, "get", fake_get)
+    monkeypatch.setattr(alerts_fetch, "_ZONE_CACHE", alerts_fetch.OrderedDict())
+
+    assert alerts_fetch.fetch_weather_alerts_zone(47.6012, -122.3321) == ("https://zone/PZZ135", [])
+    assert alerts_fetch.fetch_weather_alerts_zone(47.6049, -122.3349) == ("https://zone/PZZ135", [])
+    assert sum("/points/" in u for u in calls) == 1
+    assert sum("/alerts/active" in u for u in calls) == 2
+
+
+def test_http2_bulk_path_sends_only_http2_safe_headers(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if "/points/" in request.url.path:
+            lat = request.url.path.rsplit("/", 1)[-1].split(",")[0]
+            return httpx.Response(200, json={"properties": {"forecastZone": f"https://zone.test/{lat}"}})
+        return httpx.Response(200, json={"features": [{"properties": {"headline": "Gale"}}]})
+
+    monkeypatch.setattr(alerts_fetch, "_ZONE_CACHE", alerts_fetch.OrderedDict())
+    out = asyncio.run(alerts_fetch._fetch_alerts_http2(
+        [(47.6, -122.3), (40.0, -70.0)], transport=httpx.MockTransport(handler)))
+
+    assert out[(47.6, -122.3)] == ("https://zone.test/47.6", ["Gale"])
+    assert out[(40.0, -70.0)] == ("https://zone.test/40.0", ["Gale"])
+    assert len(seen) == 4
+    for request in seen:
+        assert request.headers["accept"] == "application/geo+json"
+        assert "connection" not in request.headers
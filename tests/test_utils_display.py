@@ -7,6 +7,7 @@ from app.utils_display import (
     ms_to_kt,
     c_to_f,
     format_us_display,
+    format_us_display_vec,
     is_maritime,
 )
 from datetime import datetime
@@ -54,6 +55,14 @@ def test_format_us_display_none_inputs():
     out2 = format_us_display(wave_height_m=None, wind_ms=None, temp_C=None)
     assert out2 == {}
 
+def test_format_us_display_vec_matches_scalar():
+    waves = [2.0, None, np.nan, 0.5]
+    winds = [5.0, 3.0, None, np.nan]
+    temps = [20.0, np.nan, -3.5, None]
+    vec = format_us_display_vec(waves, winds, temps)
+    for i, (wv, wd, tc) in enumerate(zip(waves, winds, temps)):
+        assert vec.iloc[i].to_dict() == format_us_display(wave_height_m=wv, wind_ms=wd, temp_C=tc)
+
 def test_is_maritime_stub():
     assert is_maritime(37.77, -122.42) is False
     assert isinstance(is_maritime(0, 0), bool)
\ No newline at end of file
@@ -9,7 +9,7 @@ import app.setup_imports  # noqa: F401
 from app.utils_time import (
     ensure_utc, ensure_utc_index, window_slice, coerce_utc_range, now_utc
 )
-from app.utils_geo import haversine_km, haversine_nm
+from app.utils_geo import haversine_km, haversine_nm, haversine_nm_vec
 from app.utils_weather import dewpoint_magnus_c
 
 
@@ -41,6 +41,16 @@ def test_haversine_km_nm_close_enough():
     assert 4 <= nm <= 7
 
 
+def test_haversine_nm_vec_matches_scalar():
+    sf = (37.7955, -122.3937)
+    lats = np.array([37.8199, -33.8688, np.nan])
+    lons = np.array([-122.4783, 151.2093, 0.0])
+    d = haversine_nm_vec(*sf, lats, lons)
+    assert math.isclose(d[0], haversine_nm(*sf, lats[0], lons[0]), rel_tol=1e-9)
+    assert math.isclose(d[1], haversine_nm(*sf, lats[1], lons[1]), rel_tol=1e-9)
+    assert np.isnan(d[2])
+
+
 def test_dewpoint_magnus_c_reasonable():
     # ~9.3C for 20C @ 50% RH (allow tolerance)
     dp = dewpoint_magnus_c(20.0, 50.0)
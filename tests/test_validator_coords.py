@@ -3,6 +3,7 @@ from app.field_validator import (
     validate_and_extract_coordinate_token,
     validate_and_extract_coordinate_pair
 )
+from app.utils_coordinates import coordinate_pairs_to_dd
 
 def approx(val, ref, tol=1e-4):
     return abs(val - ref) < tol
@@ -43,3 +44,10 @@ def test_range_out_of_bounds():
     assert res["valid"] is False
     notes = ";".join(res.get("notes", []))
     assert ("out of range" in notes) or ("range: out of bounds" in notes)
+
+def test_batch_pairs_to_dd_matches_tokens_and_rejects_bad():
+    lat_dd, lon_dd = coordinate_pairs_to_dd(["37 45.600N", "12 61.0N", "075 30.200W"],
+                                            ["075 30.200W", "045 00.0E", "37 45.600N"])
+    assert approx(lat_dd[0], 37 + 45.6/60) and approx(lon_dd[0], -(75 + 30.2/60))
+    assert lat_dd[1] != lat_dd[1] and approx(lon_dd[1], 45.0)  # minutes >= 60 -> NaN
+    assert lat_dd[2] != lat_dd[2] and lon_dd[2] != lon_dd[2]   # hemisphere on the wrong axis